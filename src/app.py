@@ -1,11 +1,25 @@
 import streamlit as st
-from utils.recommender import load_model, get_user_info, top_jobs_for_user, recommend_for_user
+from streamlit.errors import StreamlitAPIException
+from utils.recommender import (
+    JOB_MATCHES_PER_USER,
+    get_user_info,
+    is_recruiter,
+    top_jobs_for_user,
+    recommend_for_user,
+    top_candidates_for_job,
+)
 from utils.layout_utils import (
     show_course_cards,
     show_job_cards,
     show_job_detail,
     show_profile_card,
+    show_learning_path,
+    show_recruiter_view,
 )
+from utils.analytics import ANALYTICS_ATTRIBUTES, gap_summary, top_missing_skills
+from utils.similarity import similar_jobs
+from utils.skill_graph import learning_path_for_job
+from utils.warmup import warm_up
 from style.layout_style import apply_custom_style
 
 st.set_page_config(page_title="SkillGraph System", layout="wide")
@@ -18,7 +32,9 @@ st.caption("Discover tailored job matches and courses designed around your stren
 
 @st.cache_resource
 def init_model():
-    return load_model()
+    # Returns immediately when the process was started through serve.py; otherwise
+    # the first visitor pays for the load, so skip the sample views there.
+    return warm_up(sample_users=0)
 
 data = init_model()
 
@@ -66,7 +82,69 @@ user_id = st.session_state.user_id
 st.markdown(f"### Hello, {user_id}!")
 st.info("Explore the tabs below to review your profile, discover matching roles, and close any skill gaps with curated courses.")
 
-tabs = st.tabs(["Profile", "Job Match", "Learning Path"])
+def _rerun_job_panel():
+    # Fragment-scoped reruns are only allowed while the fragment reruns on its own.
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def _back_to_job_list():
+    st.session_state["selected_job_id"] = None
+    st.session_state["job_click_nonce"] = None
+
+@st.fragment
+def job_match_panel(jobs):
+    """Job list/detail area; card clicks and "Back" rerun only this fragment with the already-computed ``jobs``."""
+    selected_job_id = st.session_state.get("selected_job_id")
+    selected_row = None
+
+    if selected_job_id is not None:
+        resolved_id = str(selected_job_id)
+        for key in ("jid", "job_id", "id"):
+            if key in jobs.columns:
+                matches = jobs[jobs[key].astype(str) == resolved_id]
+                if not matches.empty:
+                    selected_row = matches.iloc[0]
+                    break
+
+        if selected_row is None:
+            st.session_state.selected_job_id = None
+            selected_job_id = None
+
+    if selected_job_id is None:
+        st.markdown(
+            f"""
+            <div class="job-results-header">
+                <div>
+                    <h3>Job match</h3>
+                    <p>Based on your profile data</p>
+                </div>
+                <span class="results-count">{len(jobs)} roles available</span>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        previous_selection = st.session_state.get("selected_job_id")
+        show_job_cards(jobs)
+        if st.session_state.get("selected_job_id") is not None and (
+            st.session_state.get("selected_job_id") != previous_selection
+        ):
+            _rerun_job_panel()
+    else:
+        back_col, _ = st.columns([0.2, 0.8])
+        with back_col:
+            st.button("← Back to job list", use_container_width=True, on_click=_back_to_job_list)
+
+        show_job_detail(selected_row, similar_jobs(data, selected_row.get("jid"), n=5))
+
+# Candidate lists expose other employees' personal data, so only recruiters see them.
+can_recruit = is_recruiter(data, user_id)
+tab_labels = ["Profile", "Job Match", "Learning Path", "Skill Gaps"]
+if can_recruit:
+    tab_labels.append("Recruiter")
+tabs = st.tabs(tab_labels)
 
 with tabs[0]:
     st.subheader("Your Profile")
@@ -132,53 +210,9 @@ with tabs[1]:
         unsafe_allow_html=True,
     )
 
-    jobs = top_jobs_for_user(data, user_id, n=6)
+    jobs = top_jobs_for_user(data, user_id, n=JOB_MATCHES_PER_USER)
     if jobs is not None and not jobs.empty:
-        selected_job_id = st.session_state.get("selected_job_id")
-        selected_row = None
-
-        if selected_job_id is not None:
-            resolved_id = str(selected_job_id)
-            for key in ("jid", "job_id", "id"):
-                if key in jobs.columns:
-                    matches = jobs[jobs[key].astype(str) == resolved_id]
-                    if not matches.empty:
-                        selected_row = matches.iloc[0]
-                        break
-
-            if selected_row is None:
-                st.session_state.selected_job_id = None
-                selected_job_id = None
-
-        if selected_job_id is None:
-            st.markdown(
-                f"""
-                <div class="job-results-header">
-                    <div>
-                        <h3>Job match</h3>
-                        <p>Based on your profile data</p>
-                    </div>
-                    <span class="results-count">{len(jobs)} roles available</span>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-
-            previous_selection = st.session_state.get("selected_job_id")
-            show_job_cards(jobs)
-            if st.session_state.get("selected_job_id") is not None and (
-                st.session_state.get("selected_job_id") != previous_selection
-            ):
-                st.rerun()
-        else:
-            back_col, _ = st.columns([0.2, 0.8])
-            with back_col:
-                if st.button("← Back to job list", use_container_width=True):
-                    st.session_state["selected_job_id"] = None
-                    st.session_state["job_click_nonce"] = None
-                    st.rerun()
-
-            show_job_detail(selected_row)
+        job_match_panel(jobs)
     else:
         st.session_state.selected_job_id = None
         st.session_state.job_click_nonce = None
@@ -192,3 +226,63 @@ with tabs[2]:
         show_course_cards(recs)
     else:
         st.info("No learning recommendations available yet.")
+
+    st.subheader("Skill Path to a Target Role")
+    if jobs is not None and not jobs.empty and "jid" in jobs.columns:
+        target_jid = st.selectbox(
+            "Target role",
+            jobs["jid"].tolist(),
+            format_func=lambda jid: f"{jobs.loc[jobs['jid'] == jid, 'job_title'].iloc[0]} ({jid})",
+            key="learning_path_jid",
+        )
+        show_learning_path(learning_path_for_job(data, user_id, target_jid))
+    else:
+        st.info("Skill paths appear once job matches are available.")
+
+with tabs[3]:
+    st.subheader("Organisation Skill Gaps")
+    st.caption("Skills required by employees' top job matches that they do not hold yet.")
+    cubes = data.get("skill_gap_cubes")
+    available = [attribute for attribute in ANALYTICS_ATTRIBUTES if cubes and attribute in cubes["cubes"]]
+    if available:
+        attribute = st.selectbox(
+            "Group employees by",
+            available,
+            format_func=lambda name: name.replace("_", " ").title(),
+            key="gap_attribute",
+        )
+        st.dataframe(
+            gap_summary(cubes, attribute),
+            hide_index=True,
+            width="stretch",
+            column_config={"coverage": st.column_config.ProgressColumn("Coverage", min_value=0.0, max_value=1.0)},
+        )
+        st.markdown("#### Most often missing skills")
+        st.dataframe(
+            top_missing_skills(cubes, attribute, n=5),
+            hide_index=True,
+            width="stretch",
+            column_config={"share": st.column_config.NumberColumn("Share of employees", format="percent")},
+        )
+    else:
+        st.info("No skill-gap analytics available for this artifact.")
+
+if can_recruit:
+    with tabs[4]:
+        st.subheader("Top Candidates per Job")
+        job_df = data.get("job_df")
+        if job_df is not None and not job_df.empty and "jid" in job_df.columns:
+            job_catalog = job_df.drop_duplicates(subset=["jid"]).set_index("jid")
+            title_column = "job_title" if "job_title" in job_catalog.columns else "title"
+            recruiter_jid = st.selectbox(
+                "Job",
+                job_catalog.index.tolist(),
+                format_func=lambda jid: f"{jid} · {job_catalog.at[jid, title_column]}"
+                if title_column in job_catalog.columns
+                else str(jid),
+                key="recruiter_jid",
+            )
+            candidates = top_candidates_for_job(data, recruiter_jid, n=10)
+            show_recruiter_view(job_catalog.loc[recruiter_jid].rename(recruiter_jid), candidates)
+        else:
+            st.info("No job catalogue available for recruiter view.")
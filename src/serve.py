@@ -0,0 +1,44 @@
+"""Warm the model, then start the Streamlit app in the same process.
+
+Usage (extra arguments are passed to ``streamlit run``)::
+
+    python src/serve.py --server.port 8501
+
+The Streamlit health endpoint only comes up after warm-up, and
+``utils.warmup.ready_file()`` (``skillgraph-<port>.ready`` in the temp dir by
+default) is written once the model is ready and removed on exit.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+from streamlit.web import cli as stcli
+
+from utils.warmup import status, warm_up
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+
+
+def _server_port(args):
+    for pos, arg in enumerate(args):
+        if arg.startswith("--server.port="):
+            return arg.split("=", 1)[1]
+        if arg == "--server.port" and pos + 1 < len(args):
+            return args[pos + 1]
+    return None
+
+
+def main() -> int:
+    port = _server_port(sys.argv[1:])
+    if port:
+        # Streamlit reads the same variable; warm-up keys the ready file on it.
+        os.environ["STREAMLIT_SERVER_PORT"] = port
+    warm_up()
+    print(f"Warm-up finished: {json.dumps(status()['timings'])}", flush=True)
+    sys.argv = ["streamlit", "run", str(APP_PATH), *sys.argv[1:]]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
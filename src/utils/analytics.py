@@ -0,0 +1,254 @@
+"""Organisation-wide skill-gap aggregates.
+
+Each employee's gap is the set of ``proj_quals`` skills required by their top
+matched jobs that they do not hold. Gaps are integer-coded into per-employee
+skill matrices and summed into one cube per employee attribute (groups x
+skills). Cubes are built once with the artifact and patched in place when an
+employee or job row changes, so dashboards never rescan every user.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.skills import split_skills
+
+ANALYTICS_ATTRIBUTES = ("city", "major", "degree_type", "gender")
+# How many of an employee's best-scoring jobs define the skills they need.
+TARGET_JOBS = 5
+
+
+def _encode(values, skills: Dict[str, int], skill_map: dict) -> np.ndarray:
+    """Boolean ``(len(values), len(skills))`` matrix; unseen skills extend ``skills``."""
+    pieces = [split_skills(value, skill_map) for value in values]
+    for row in pieces:
+        for skill in row:
+            skills.setdefault(skill, len(skills))
+    matrix = np.zeros((len(values), len(skills)), dtype=bool)
+    for row, row_skills in enumerate(pieces):
+        matrix[row, [skills[skill] for skill in row_skills]] = True
+    return matrix
+
+
+def _widen(matrix: np.ndarray, width: int) -> np.ndarray:
+    if matrix.shape[1] >= width:
+        return matrix
+    return np.pad(matrix, ((0, 0), (0, width - matrix.shape[1])))
+
+
+def _targets(data, user_ids) -> pd.DataFrame:
+    """Top ``TARGET_JOBS`` jids per user by score, as ``user_id, jid`` rows."""
+    merged = data.get("merged", pd.DataFrame())
+    if merged.empty or not {"user_id", "jid"}.issubset(merged.columns):
+        return pd.DataFrame(columns=["user_id", "jid"])
+    frame = merged[merged["user_id"].isin(user_ids)]
+    if "score" in frame.columns:
+        frame = frame.sort_values(by=["user_id", "score"], ascending=[True, False], kind="stable")
+    frame = frame.drop_duplicates(subset=["user_id", "jid"])
+    return frame[frame.groupby("user_id", sort=False).cumcount() < TARGET_JOBS][["user_id", "jid"]]
+
+
+def _required(cubes: dict, emp_positions: np.ndarray, job_positions: np.ndarray, n_rows: int) -> np.ndarray:
+    required = np.zeros((n_rows, cubes["jobs"].shape[1]), dtype=bool)
+    known = job_positions >= 0
+    np.logical_or.at(required, emp_positions[known], cubes["jobs"][job_positions[known]])
+    return required
+
+
+def _accumulate(cubes: dict, rows: np.ndarray, sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) active employee ``rows`` from every cube."""
+    rows = rows[cubes["active"][rows]]
+    required = cubes["required"][rows].astype(np.int64)
+    missing = cubes["missing"][rows].astype(np.int64)
+    for attribute, cube in cubes["cubes"].items():
+        codes = cube["codes"][rows]
+        np.add.at(cube["employees"], codes, sign)
+        np.add.at(cube["required"], codes, sign * required)
+        np.add.at(cube["missing"], codes, sign * missing)
+
+
+def _grow(cubes: dict) -> None:
+    """Keep every matrix as wide as the skill vocabulary after new skills appear."""
+    width = len(cubes["skills"])
+    for key in ("employee_skills", "jobs", "required", "missing"):
+        if key in cubes:
+            cubes[key] = _widen(cubes[key], width)
+    for cube in cubes["cubes"].values():
+        cube["required"] = _widen(cube["required"], width)
+        cube["missing"] = _widen(cube["missing"], width)
+
+
+def build_skill_gap_cubes(data, attributes=ANALYTICS_ATTRIBUTES) -> dict:
+    """Per-employee skill matrices plus one gap cube per attribute in ``attributes``."""
+    skill_map = data.setdefault("skill_map", {})
+    emp_df = data.get("employee_df", pd.DataFrame())
+    job_df = data.get("job_df", pd.DataFrame())
+    skills: Dict[str, int] = {}
+
+    employees = emp_df.drop_duplicates(subset=["user_id"]) if "user_id" in emp_df.columns else pd.DataFrame(columns=["user_id"])
+    jobs = job_df.drop_duplicates(subset=["jid"]) if "jid" in job_df.columns else pd.DataFrame(columns=["jid"])
+    employee_skills = _encode(employees.get("skill_name", pd.Series([None] * len(employees))).tolist(), skills, skill_map)
+    job_skills = _encode(jobs.get("proj_quals", pd.Series([None] * len(jobs))).tolist(), skills, skill_map)
+
+    cubes = {
+        "skills": skills,
+        "employee_ids": employees["user_id"].tolist(),
+        "employee_positions": {user_id: pos for pos, user_id in enumerate(employees["user_id"])},
+        "active": np.ones(len(employees), dtype=bool),
+        "job_positions": {jid: pos for pos, jid in enumerate(jobs["jid"])},
+        "employee_skills": _widen(employee_skills, len(skills)),
+        "jobs": job_skills,
+        "targets": {},
+        "cubes": {},
+    }
+
+    targets = _targets(data, employees["user_id"])
+    emp_positions = targets["user_id"].map(cubes["employee_positions"]).to_numpy(dtype=np.int64)
+    job_positions = targets["jid"].map(cubes["job_positions"]).fillna(-1).to_numpy(dtype=np.int64)
+    cubes["targets"] = targets.groupby("user_id", sort=False)["jid"].agg(list).to_dict()
+
+    cubes["required"] = _required(cubes, emp_positions, job_positions, len(employees))
+    cubes["missing"] = cubes["required"] & ~cubes["employee_skills"]
+
+    width = len(skills)
+    for attribute in attributes:
+        if attribute not in employees.columns:
+            continue
+        codes, groups = pd.factorize(employees[attribute].fillna("Unknown"))
+        cubes["cubes"][attribute] = {
+            "groups": list(groups),
+            "codes": codes.astype(np.int64),
+            "employees": np.zeros(len(groups), dtype=np.int64),
+            "required": np.zeros((len(groups), width), dtype=np.int64),
+            "missing": np.zeros((len(groups), width), dtype=np.int64),
+        }
+    _accumulate(cubes, np.arange(len(employees)), 1)
+    return cubes
+
+
+def _group_code(cube: dict, value) -> int:
+    value = "Unknown" if value is None or (isinstance(value, float) and pd.isna(value)) else value
+    if value not in cube["groups"]:
+        cube["groups"].append(value)
+        cube["employees"] = np.append(cube["employees"], 0)
+        cube["required"] = np.vstack([cube["required"], np.zeros((1, cube["required"].shape[1]), dtype=np.int64)])
+        cube["missing"] = np.vstack([cube["missing"], np.zeros((1, cube["missing"].shape[1]), dtype=np.int64)])
+    return cube["groups"].index(value)
+
+
+def _refresh_employees(cubes: dict, data, rows: np.ndarray) -> None:
+    """Recompute target jobs, required and missing skills for employee ``rows`` only."""
+    user_ids = [cubes["employee_ids"][row] for row in rows]
+    targets = _targets(data, user_ids)
+    grouped = targets.groupby("user_id", sort=False)["jid"].agg(list)
+    for user_id in user_ids:
+        cubes["targets"][user_id] = grouped.get(user_id, [])
+
+    local = {user_id: index for index, user_id in enumerate(user_ids)}
+    emp_positions = targets["user_id"].map(local).to_numpy(dtype=np.int64)
+    job_positions = targets["jid"].map(cubes["job_positions"]).fillna(-1).to_numpy(dtype=np.int64)
+    required = _required(cubes, emp_positions, job_positions, len(rows))
+    cubes["required"][rows] = required
+    cubes["missing"][rows] = required & ~cubes["employee_skills"][rows]
+
+
+def update_employee(data, user_id) -> None:
+    """Re-derive one employee's skills, groups and target jobs and patch the cubes."""
+    cubes = data["skill_gap_cubes"]
+    skill_map = data.setdefault("skill_map", {})
+    emp_df = data.get("employee_df", pd.DataFrame())
+    record = emp_df[emp_df["user_id"] == user_id]
+
+    pos = cubes["employee_positions"].get(user_id)
+    if pos is not None:
+        _accumulate(cubes, np.array([pos]), -1)
+    if record.empty:
+        if pos is not None:
+            # Keep the row so positions stay stable; it just stops counting.
+            cubes["active"][pos] = False
+            cubes["targets"].pop(user_id, None)
+        return
+
+    row = record.iloc[0]
+    skill_row = _encode([row.get("skill_name")], cubes["skills"], skill_map)
+    _grow(cubes)
+    if pos is None:
+        pos = len(cubes["employee_skills"])
+        cubes["employee_positions"][user_id] = pos
+        cubes["employee_ids"].append(user_id)
+        cubes["active"] = np.append(cubes["active"], False)
+        for key in ("employee_skills", "required", "missing"):
+            cubes[key] = np.vstack([cubes[key], np.zeros((1, cubes[key].shape[1]), dtype=bool)])
+        for cube in cubes["cubes"].values():
+            cube["codes"] = np.append(cube["codes"], 0)
+
+    cubes["employee_skills"][pos] = _widen(skill_row, len(cubes["skills"]))[0]
+    for attribute, cube in cubes["cubes"].items():
+        cube["codes"][pos] = _group_code(cube, row.get(attribute))
+    cubes["active"][pos] = True
+    _refresh_employees(cubes, data, np.array([pos]))
+    _accumulate(cubes, np.array([pos]), 1)
+
+
+def update_job(data, jid) -> None:
+    """Re-encode one job's requirements and patch the employees that target it."""
+    cubes = data["skill_gap_cubes"]
+    skill_map = data.setdefault("skill_map", {})
+    job_df = data.get("job_df", pd.DataFrame())
+    record = job_df[job_df["jid"] == jid]
+
+    job_row = _encode([record.iloc[0].get("proj_quals")] if not record.empty else [None], cubes["skills"], skill_map)
+    _grow(cubes)
+    pos = cubes["job_positions"].get(jid)
+    if pos is None:
+        pos = len(cubes["jobs"])
+        cubes["job_positions"][jid] = pos
+        cubes["jobs"] = np.vstack([cubes["jobs"], np.zeros((1, cubes["jobs"].shape[1]), dtype=bool)])
+    cubes["jobs"][pos] = _widen(job_row, len(cubes["skills"]))[0]
+
+    affected = np.array(
+        [cubes["employee_positions"][user_id] for user_id, jids in cubes["targets"].items() if jid in jids],
+        dtype=np.int64,
+    )
+    if len(affected):
+        _accumulate(cubes, affected, -1)
+        _refresh_employees(cubes, data, affected)
+        _accumulate(cubes, affected, 1)
+
+
+def gap_summary(cubes: dict, attribute: str) -> pd.DataFrame:
+    """Employees, required and missing skill counts, and coverage ratio per group."""
+    cube = cubes["cubes"].get(attribute)
+    if cube is None:
+        return pd.DataFrame()
+    required = cube["required"].sum(axis=1)
+    missing = cube["missing"].sum(axis=1)
+    summary = pd.DataFrame({
+        attribute: cube["groups"],
+        "employees": cube["employees"],
+        "required_skills": required,
+        "missing_skills": missing,
+        "coverage": np.where(required > 0, 1 - missing / np.maximum(required, 1), 1.0),
+    })
+    summary = summary[summary["employees"] > 0]
+    return summary.sort_values(by="missing_skills", ascending=False).reset_index(drop=True)
+
+
+def top_missing_skills(cubes: dict, attribute: str, n: int = 5, group: Optional[str] = None) -> pd.DataFrame:
+    """The ``n`` most often missing skills per group, with the share of employees lacking each."""
+    cube = cubes["cubes"].get(attribute)
+    if cube is None:
+        return pd.DataFrame()
+    names = np.array(list(cubes["skills"]), dtype=object)
+    groups = np.array(cube["groups"], dtype=object)
+    group_idx, skill_idx = np.nonzero(cube["missing"])
+    frame = pd.DataFrame({
+        attribute: groups[group_idx],
+        "skill": names[skill_idx],
+        "missing": cube["missing"][group_idx, skill_idx],
+        "share": cube["missing"][group_idx, skill_idx] / np.maximum(cube["employees"][group_idx], 1),
+    })
+    if group is not None:
+        frame = frame[frame[attribute] == group]
+    frame = frame.sort_values(by=[attribute, "missing"], ascending=[True, False], kind="stable")
+    return frame.groupby(attribute, sort=False).head(n).reset_index(drop=True)
@@ -0,0 +1,267 @@
+"""Offline ranking evaluation for recommender artifacts.
+
+Run from ``src``::
+
+    python -m utils.evaluation baseline.pkl candidate.pkl --holdout applications.csv
+"""
+import argparse
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.recommender import load_model
+from utils.skills import split_skills
+
+METRICS = ("precision", "recall", "map", "ndcg")
+POSITIVE_STATUSES = ("Interview", "Approved")
+# Below this many users the pool start-up costs more than the metric maths.
+PARALLEL_MIN_USERS = 20_000
+
+
+def load_holdout(path: str, positive_statuses=POSITIVE_STATUSES) -> pd.DataFrame:
+    """Read held-out interactions as ``user_id, item_id, kind`` rows.
+
+    Accepts either that layout directly or raw application records
+    (``user_id, jid[, status]``), keeping only positive outcomes.
+    """
+    records = pd.read_csv(path, dtype=str)
+    if {"user_id", "item_id", "kind"}.issubset(records.columns):
+        return records[["user_id", "item_id", "kind"]].drop_duplicates()
+
+    if "status" in records.columns:
+        records = records[records["status"].isin(positive_statuses)]
+    holdout = records[["user_id", "jid"]].rename(columns={"jid": "item_id"})
+    holdout["kind"] = "job"
+    return holdout.drop_duplicates().reset_index(drop=True)
+
+
+def _skill_matrix(values: pd.Series, vocabulary: dict, skill_map: dict) -> np.ndarray:
+    matrix = np.zeros((len(values), len(vocabulary)), dtype=bool)
+    for row, value in enumerate(values):
+        for skill in split_skills(value, skill_map):
+            if skill in vocabulary:
+                matrix[row, vocabulary[skill]] = True
+    return matrix
+
+
+def synthetic_holdout(data, per_user: int = 5, candidates: int = 200, min_coverage: float = 0.5, seed: int = 0) -> pd.DataFrame:
+    """Build a stand-in holdout from skill overlap when no application log exists.
+
+    A job counts as relevant when the employee already holds at least
+    ``min_coverage`` of its ``proj_quals``; a course counts when it teaches a
+    skill the employee lacks. Up to ``per_user`` items of each kind are sampled
+    from ``candidates`` random draws per employee.
+    """
+    rng = np.random.default_rng(seed)
+    emp_df = data.get("employee_df", pd.DataFrame())
+    job_df = data.get("job_df", pd.DataFrame())
+    course_df = data.get("course_df", pd.DataFrame())
+    if emp_df.empty:
+        return pd.DataFrame(columns=["user_id", "item_id", "kind"])
+
+    skill_map = data.setdefault("skill_map", {})
+    vocabulary = {}
+    for frame, column in ((emp_df, "skill_name"), (job_df, "proj_quals"), (course_df, "skills_taught")):
+        if column in frame.columns:
+            for value in frame[column]:
+                for skill in split_skills(value, skill_map):
+                    vocabulary.setdefault(skill, len(vocabulary))
+
+    users = emp_df["user_id"].to_numpy()
+    user_skills = _skill_matrix(emp_df.get("skill_name", pd.Series([""] * len(emp_df))), vocabulary, skill_map)
+
+    parts = []
+    for frame, column, id_column, kind in (
+        (job_df, "proj_quals", "jid", "job"),
+        (course_df, "skills_taught", "course_id", "course"),
+    ):
+        if frame.empty or column not in frame.columns or id_column not in frame.columns:
+            continue
+        item_skills = _skill_matrix(frame[column], vocabulary, skill_map)
+        draws = rng.integers(len(frame), size=(len(users), candidates))
+        drawn = item_skills[draws]
+        if kind == "job":
+            required = drawn.sum(axis=2)
+            covered = (drawn & user_skills[:, None, :]).sum(axis=2)
+            relevant = (required > 0) & (covered >= min_coverage * required)
+        else:
+            relevant = (drawn & ~user_skills[:, None, :]).any(axis=2)
+
+        user_idx, draw_idx = np.nonzero(relevant)
+        pairs = pd.DataFrame({
+            "user_id": users[user_idx],
+            "item_id": frame[id_column].to_numpy()[draws[user_idx, draw_idx]],
+        }).drop_duplicates()
+        pairs = pairs.groupby("user_id", sort=False).head(per_user)
+        pairs["kind"] = kind
+        parts.append(pairs)
+
+    if not parts:
+        return pd.DataFrame(columns=["user_id", "item_id", "kind"])
+    return pd.concat(parts, ignore_index=True)
+
+
+def _job_rankings(data) -> pd.DataFrame:
+    merged = data.get("merged", pd.DataFrame())
+    if merged.empty or not {"user_id", "jid"}.issubset(merged.columns):
+        return pd.DataFrame(columns=["user_id", "item_id", "score"])
+    frame = merged[["user_id", "jid"]].rename(columns={"jid": "item_id"})
+    frame["score"] = merged["score"].astype(float) if "score" in merged.columns else 0.0
+    return frame
+
+
+def _course_rankings(data) -> pd.DataFrame:
+    """Course recommendations as ``user_id, item_id, score`` rows keyed by ``course_id``.
+
+    Records that carry only ``course_name`` are resolved through ``course_df``;
+    any that still have no id are dropped with a warning rather than scored in
+    a different id space from the holdout.
+    """
+    recs = data.get("recommendations", {})
+    rows = [
+        (user_id, record.get("course_id"), record.get("course_name"), record.get("score", 0.0))
+        for user_id, records in recs.items()
+        for record in records
+    ]
+    frame = pd.DataFrame(rows, columns=["user_id", "item_id", "course_name", "score"])
+    course_df = data.get("course_df", pd.DataFrame())
+    if frame["item_id"].isna().any() and {"course_id", "course_name"}.issubset(course_df.columns):
+        by_name = course_df.drop_duplicates(subset=["course_name"]).set_index("course_name")["course_id"]
+        frame["item_id"] = frame["item_id"].fillna(frame["course_name"].map(by_name))
+
+    unresolved = int(frame["item_id"].isna().sum())
+    if unresolved:
+        warnings.warn(f"{unresolved} course recommendations have no course_id and were skipped", stacklevel=2)
+    frame = frame.dropna(subset=["item_id"])
+    return frame.assign(score=frame["score"].astype(float))[["user_id", "item_id", "score"]]
+
+
+def _ranked_codes(rankings: pd.DataFrame, users: pd.Index, items: pd.Index, k: int) -> np.ndarray:
+    """Return an ``(n_users, k)`` matrix of item codes by descending score, ``-1`` padded."""
+    ranked = np.full((len(users), k), -1, dtype=np.int64)
+    if rankings.empty:
+        return ranked
+
+    user_codes = users.get_indexer(rankings["user_id"])
+    item_codes = items.get_indexer(rankings["item_id"].astype(str))
+    frame = pd.DataFrame({"u": user_codes, "i": item_codes, "s": rankings["score"].to_numpy()})
+    frame = frame[frame["u"] >= 0]
+    frame = frame.sort_values(["u", "s"], ascending=[True, False], kind="stable")
+    frame = frame.drop_duplicates(subset=["u", "i"], keep="first")
+    rank = frame.groupby("u", sort=False).cumcount().to_numpy()
+    keep = rank < k
+    ranked[frame["u"].to_numpy()[keep], rank[keep]] = frame["i"].to_numpy()[keep]
+    return ranked
+
+
+def _metric_block(args: Tuple[np.ndarray, np.ndarray, int]) -> np.ndarray:
+    """Per-user ``(precision, recall, map, ndcg)`` rows for a block of hit vectors."""
+    hits, n_relevant, k = args
+    hits = hits.astype(np.float64)
+    positions = np.arange(1, k + 1)
+    discounts = 1.0 / np.log2(positions + 1)
+    ideal = np.cumsum(discounts)
+    capped = np.minimum(n_relevant, k)
+
+    hit_count = hits.sum(axis=1)
+    precision = hit_count / k
+    recall = hit_count / n_relevant
+    average_precision = (np.cumsum(hits, axis=1) / positions * hits).sum(axis=1) / capped
+    ndcg = (hits * discounts).sum(axis=1) / ideal[capped - 1]
+    return np.column_stack([precision, recall, average_precision, ndcg])
+
+
+def _score_shard(args: Tuple[pd.DataFrame, pd.DataFrame, int]) -> np.ndarray:
+    """Rank, hit-test and score one shard of users; returns per-user metric rows."""
+    rankings, relevant, k = args
+    users = pd.Index(relevant["user_id"].unique())
+    items = pd.Index(pd.unique(pd.concat([relevant["item_id"], rankings["item_id"]])))
+
+    ranked = _ranked_codes(rankings, users, items, k)
+    rel_users = users.get_indexer(relevant["user_id"])
+    rel_items = items.get_indexer(relevant["item_id"])
+    n_items = len(items)
+    hits = (ranked >= 0) & np.isin(
+        np.arange(len(users))[:, None] * n_items + ranked,
+        rel_users * n_items + rel_items,
+    )
+    n_relevant = np.bincount(rel_users, minlength=len(users))
+    return _metric_block((hits, n_relevant, k))
+
+
+def _score_rankings(rankings: pd.DataFrame, relevant: pd.DataFrame, k: int, workers: Optional[int]) -> Tuple[np.ndarray, int]:
+    rankings = rankings.assign(user_id=rankings["user_id"].astype(str), item_id=rankings["item_id"].astype(str))
+    relevant = relevant.assign(user_id=relevant["user_id"].astype(str), item_id=relevant["item_id"].astype(str))
+    n_users = relevant["user_id"].nunique()
+
+    if workers != 1 and n_users >= PARALLEL_MIN_USERS:
+        # Shard by user before ranking so the sort/groupby and hit test run in the workers too.
+        workers = workers or os.cpu_count() or 1
+        codes, _ = pd.factorize(pd.concat([relevant["user_id"], rankings["user_id"]]))
+        relevant_shard = codes[: len(relevant)] % workers
+        ranking_shard = codes[len(relevant):] % workers
+        shards = [
+            (rankings[ranking_shard == shard], relevant[relevant_shard == shard], k)
+            for shard in range(workers)
+            if (relevant_shard == shard).any()
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scores = np.vstack(list(pool.map(_score_shard, shards)))
+    else:
+        scores = _score_shard((rankings, relevant, k))
+    return scores.mean(axis=0), n_users
+
+
+def evaluate(data, holdout: pd.DataFrame, k: int = 10, workers: Optional[int] = None) -> pd.DataFrame:
+    """Score the job and course rankings of one artifact against ``holdout``."""
+    rows = []
+    for kind, rankings in (("job", _job_rankings(data)), ("course", _course_rankings(data))):
+        relevant = holdout[holdout["kind"] == kind].drop_duplicates(subset=["user_id", "item_id"])
+        if relevant.empty:
+            continue
+        means, n_users = _score_rankings(rankings, relevant, k, workers)
+        for metric, value in zip(METRICS, means):
+            rows.append({"kind": kind, "metric": f"{metric}@{k}", "value": float(value), "users": n_users})
+    return pd.DataFrame(rows, columns=["kind", "metric", "value", "users"])
+
+
+def compare_artifacts(baseline, candidate, holdout: pd.DataFrame, k: int = 10, workers: Optional[int] = None) -> pd.DataFrame:
+    """Side-by-side metrics for two loaded artifacts, with ``delta = candidate - baseline``."""
+    before = evaluate(baseline, holdout, k=k, workers=workers)
+    after = evaluate(candidate, holdout, k=k, workers=workers)
+    report = before.merge(after, on=["kind", "metric", "users"], how="outer", suffixes=("_baseline", "_candidate"))
+    report = report.rename(columns={"value_baseline": "baseline", "value_candidate": "candidate"})
+    report["delta"] = report["candidate"] - report["baseline"]
+    return report[["kind", "metric", "baseline", "candidate", "delta", "users"]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two recommender artifacts on held-out interactions.")
+    parser.add_argument("baseline", help="Path to the current artifact (.pkl)")
+    parser.add_argument("candidate", help="Path to the refreshed artifact (.pkl)")
+    parser.add_argument("--holdout", help="CSV of application records; a synthetic holdout is used when omitted")
+    parser.add_argument("-k", type=int, default=10, help="Ranking cut-off (default: 10)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size for large user sets")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic holdout")
+    parser.add_argument("--max-drop", type=float, default=None, help="Fail when any metric drops by more than this")
+    args = parser.parse_args(argv)
+
+    baseline = load_model(args.baseline)
+    candidate = load_model(args.candidate)
+    holdout = load_holdout(args.holdout) if args.holdout else synthetic_holdout(baseline, seed=args.seed)
+
+    report = compare_artifacts(baseline, candidate, holdout, k=args.k, workers=args.workers)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+
+    if args.max_drop is not None and (report["delta"] < -args.max_drop).any():
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
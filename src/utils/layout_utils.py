@@ -9,6 +9,8 @@ import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
+from utils.skills import canonicalize_skills
+
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 IMAGES_DIR = REPO_ROOT / "images"
@@ -27,7 +29,7 @@ job_link_listener = components.declare_component(
 
 
 def _render_tags(items: Iterable[str]) -> str:
-    tags = [f"<span class='pill'>{escape(item.strip())}</span>" for item in items if item and item.strip()]
+    tags = [f"<span class='pill'>{escape(item)}</span>" for item in canonicalize_skills(items)]
     return "".join(tags)
 
 
@@ -364,8 +366,107 @@ def _derive_job_highlights(description: Optional[str]) -> Tuple[str, List[str]]:
     return overview, responsibilities
 
 
-def show_job_detail(job: Optional[pd.Series]) -> None:
-    """Render a detailed job preview panel."""
+def _clean(value: Optional[str], fallback: str = "—") -> str:
+    if value is None:
+        return fallback
+    if isinstance(value, float) and pd.isna(value):
+        return fallback
+    text = str(value).strip()
+    return text or fallback
+
+
+def _format_match(score) -> str:
+    if score is None or pd.isna(score):
+        return "—"
+    try:
+        value = float(score) * 100 if float(score) <= 1 else float(score)
+    except (TypeError, ValueError):
+        return "—"
+    return f"{value:.0f}%"
+
+
+def _similar_roles_html(similar: Optional[pd.DataFrame]) -> str:
+    if similar is None or similar.empty:
+        return ""
+
+    items = []
+    for role in similar.to_dict(orient="records"):
+        title = escape(_clean(role.get("job_title") or role.get("title"), "Untitled role"))
+        location = escape(_clean(role.get("location"), "Location not specified"))
+        items.append(
+            "<li>"
+            f"<span class='similar-title'>{title}</span>"
+            f"<span class='similar-meta'>{location} • {_format_match(role.get('similarity'))} similar</span>"
+            "</li>"
+        )
+    return (
+        "<div class='sidebar-card'>"
+        "<h4>Similar roles</h4>"
+        f"<ul class='similar-list'>{''.join(items)}</ul>"
+        "</div>"
+    )
+
+
+def _job_sidebar_html(
+    job_data: dict,
+    score_label: str = "Your match score",
+    action_label: str = "Apply now",
+    similar: Optional[pd.DataFrame] = None,
+) -> str:
+    """Build the job summary sidebar shared by the job detail and recruiter views."""
+
+    raw_company = _clean(job_data.get("company"), "Unknown company")
+    location = escape(_clean(job_data.get("location"), "Location not specified"))
+    employment_type = escape(_clean(job_data.get("employment_type") or job_data.get("job_type"), "Full-time"))
+    salary = escape(_clean(job_data.get("salary_range") or job_data.get("salary"), "Not disclosed"))
+    experience = escape(_clean(job_data.get("experience_level") or job_data.get("level"), "All levels"))
+    start_date = escape(_clean(job_data.get("start_date"), "Immediate"))
+    end_date = escape(_clean(job_data.get("end_date"), "Open until filled"))
+    match_display = _format_match(job_data.get("score"))
+    contact_domain = re.sub(r"[^a-z0-9]", "", raw_company.lower()) or "company"
+
+    return f"""<aside class="job-detail-sidebar">
+            <div class="job-summary-card">
+                <div class="summary-group">
+                    <span class="summary-label">Location</span>
+                    <span class="summary-value">{location}</span>
+                </div>
+                <div class="summary-group">
+                    <span class="summary-label">Employment type</span>
+                    <span class="summary-value">{employment_type}</span>
+                </div>
+                <div class="summary-group">
+                    <span class="summary-label">Experience level</span>
+                    <span class="summary-value">{experience}</span>
+                </div>
+                <div class="summary-group">
+                    <span class="summary-label">Salary range</span>
+                    <span class="summary-value">{salary}</span>
+                </div>
+                <div class="summary-group">
+                    <span class="summary-label">Start date</span>
+                    <span class="summary-value">{start_date}</span>
+                </div>
+                <div class="summary-group">
+                    <span class="summary-label">Closing date</span>
+                    <span class="summary-value">{end_date}</span>
+                </div>
+                <div class="summary-group highlight">
+                    <span class="summary-label">{escape(score_label)}</span>
+                    <span class="summary-value score">{match_display}</span>
+                </div>
+                <button class="apply-button" type="button">{escape(action_label)}</button>
+            </div>
+            <div class="sidebar-card">
+                <h4>Recruiter information</h4>
+                <p class="sidebar-text">Have questions? Reach out to the talent team for more details about the role and interview process.</p>
+                <div class="contact-chip">talent@{contact_domain}.com</div>
+            </div>{_similar_roles_html(similar)}
+        </aside>"""
+
+
+def show_job_detail(job: Optional[pd.Series], similar: Optional[pd.DataFrame] = None) -> None:
+    """Render a detailed job preview panel, with optional "similar roles" in the sidebar."""
 
     if job is None:
         st.markdown(
@@ -379,24 +480,12 @@ def show_job_detail(job: Optional[pd.Series]) -> None:
     else:
         job_data = job or {}
 
-    def _clean(value: Optional[str], fallback: str = "—") -> str:
-        if value is None:
-            return fallback
-        if isinstance(value, float) and pd.isna(value):
-            return fallback
-        text = str(value).strip()
-        return text or fallback
-
     raw_job_title = _clean(job_data.get("job_title") or job_data.get("title"), "Untitled role")
     raw_company = _clean(job_data.get("company"), "Unknown company")
     job_title = escape(raw_job_title)
     company = escape(raw_company)
     location = escape(_clean(job_data.get("location"), "Location not specified"))
     employment_type = escape(_clean(job_data.get("employment_type") or job_data.get("job_type"), "Full-time"))
-    salary = escape(_clean(job_data.get("salary_range") or job_data.get("salary"), "Not disclosed"))
-    experience = escape(_clean(job_data.get("experience_level") or job_data.get("level"), "All levels"))
-    start_date = escape(_clean(job_data.get("start_date"), "Immediate"))
-    end_date = escape(_clean(job_data.get("end_date"), "Open until filled"))
 
     overview, bullets = _derive_job_highlights(job_data.get("job_desc"))
     overview_html = f"<p>{escape(overview)}</p>" if overview else ""
@@ -420,16 +509,6 @@ def show_job_detail(job: Optional[pd.Series]) -> None:
     if not qualification_tags:
         qualification_tags = "<div class='empty-copy'>This role has no specific skills listed yet.</div>"
 
-    match_score = job_data.get("score")
-    if pd.notna(match_score):
-        try:
-            match_value = float(match_score) * 100 if float(match_score) <= 1 else float(match_score)
-            match_display = f"{match_value:.0f}%"
-        except (TypeError, ValueError):
-            match_display = "—"
-    else:
-        match_display = "—"
-
     benefits = [
         "Competitive compensation package",
         "Flexible work arrangements and remote-friendly culture",
@@ -438,7 +517,6 @@ def show_job_detail(job: Optional[pd.Series]) -> None:
     benefits_html = "<ul class='detail-list'>" + "".join(f"<li>{escape(item)}</li>" for item in benefits) + "</ul>"
 
     about_team = f"Join {company} to collaborate with a cross-functional team focused on delivering impactful digital experiences."
-    contact_domain = re.sub(r"[^a-z0-9]", "", raw_company.lower()) or "company"
 
     detail_html = f"""
     <div class="job-detail-wrapper">
@@ -474,50 +552,92 @@ def show_job_detail(job: Optional[pd.Series]) -> None:
                 </section>
             </article>
         </div>
-        <aside class="job-detail-sidebar">
-            <div class="job-summary-card">
-                <div class="summary-group">
-                    <span class="summary-label">Location</span>
-                    <span class="summary-value">{location}</span>
-                </div>
-                <div class="summary-group">
-                    <span class="summary-label">Employment type</span>
-                    <span class="summary-value">{employment_type}</span>
-                </div>
-                <div class="summary-group">
-                    <span class="summary-label">Experience level</span>
-                    <span class="summary-value">{experience}</span>
-                </div>
-                <div class="summary-group">
-                    <span class="summary-label">Salary range</span>
-                    <span class="summary-value">{salary}</span>
-                </div>
-                <div class="summary-group">
-                    <span class="summary-label">Start date</span>
-                    <span class="summary-value">{start_date}</span>
-                </div>
-                <div class="summary-group">
-                    <span class="summary-label">Closing date</span>
-                    <span class="summary-value">{end_date}</span>
-                </div>
-                <div class="summary-group highlight">
-                    <span class="summary-label">Your match score</span>
-                    <span class="summary-value score">{match_display}</span>
-                </div>
-                <button class="apply-button" type="button">Apply now</button>
-            </div>
-            <div class="sidebar-card">
-                <h4>Recruiter information</h4>
-                <p class="sidebar-text">Have questions? Reach out to the talent team for more details about the role and interview process.</p>
-                <div class="contact-chip">talent@{contact_domain}.com</div>
-            </div>
-        </aside>
+        {_job_sidebar_html(job_data, similar=similar)}
     </div>
     """
 
     st.markdown(detail_html, unsafe_allow_html=True)
 
 
+def _candidate_card_html(candidate: dict) -> str:
+    user_id = _clean(candidate.get("user_id"), "")
+    full_name = f"{_clean(candidate.get('first_name'), '')} {_clean(candidate.get('last_name'), '')}".strip()
+    name = escape(full_name or user_id or "Unnamed employee")
+    city = escape(_clean(candidate.get("city"), "Location not specified"))
+    major = escape(_clean(candidate.get("major"), "Specialisation unavailable"))
+    degree = escape(_clean(candidate.get("degree_type"), "Degree not specified"))
+    gpa = escape(_clean(candidate.get("gpa"), "—"))
+
+    skills = _render_tags(name for name, _ in _pair_skills(candidate))
+    if not skills:
+        skills = "<span class='pill muted'>Skills unavailable</span>"
+
+    return (
+        "<article class='job-card'>"
+        "<div class='job-card-leading'>"
+        f"<div class='job-card-badge' aria-hidden='true'>{escape(_initials(candidate))}</div>"
+        "</div>"
+        "<div class='job-card-content'>"
+        "<div class='job-card-header'>"
+        f"<div class='job-card-title'>{name}</div>"
+        f"<span class='match-chip'>Match {_format_match(candidate.get('score'))}</span>"
+        "</div>"
+        "<div class='job-card-meta'>"
+        f"<span>{escape(user_id)}</span><span class='dot'></span><span>{city}</span><span class='dot'></span><span>{major}</span>"
+        "</div>"
+        "<div class='job-card-highlights'>"
+        f"<span class='pill soft'>{degree}</span><span class='pill muted'>GPA {gpa}</span>"
+        "</div>"
+        f"<div class='job-card-skills' aria-label='Declared skills'>{skills}</div>"
+        "</div>"
+        "</article>"
+    )
+
+
+def show_recruiter_view(job: Optional[pd.Series], candidates: pd.DataFrame) -> None:
+    """Render the best-matching employees for a job next to its summary sidebar."""
+
+    if job is None:
+        st.markdown(
+            "<div class='job-detail-empty card'>Select a job to see its best-matching employees.</div>",
+            unsafe_allow_html=True,
+        )
+        return
+
+    job_data = job.to_dict() if isinstance(job, pd.Series) else dict(job)
+    job_title = escape(_clean(job_data.get("job_title") or job_data.get("title"), "Untitled role"))
+    company = escape(_clean(job_data.get("company"), "Unknown company"))
+    location = escape(_clean(job_data.get("location"), "Location not specified"))
+
+    if candidates is not None and not candidates.empty:
+        job_data["score"] = candidates["score"].max()
+        cards_html = "".join(_candidate_card_html(row) for row in candidates.to_dict(orient="records"))
+    else:
+        job_data["score"] = None
+        cards_html = "<div class='empty-copy'>No employees have been scored against this role yet.</div>"
+
+    count = 0 if candidates is None else len(candidates)
+    recruiter_html = f"""
+    <div class="job-detail-wrapper">
+        <div class="job-detail-main">
+            <article class="detail-card">
+                <header class="detail-header">
+                    <h2>{job_title}</h2>
+                    <p>{company} • {location} • {count} top candidates</p>
+                </header>
+                <section class="detail-section">
+                    <h3>Best-matching employees</h3>
+                    {cards_html}
+                </section>
+            </article>
+        </div>
+        {_job_sidebar_html(job_data, score_label="Top candidate match", action_label="Contact shortlist")}
+    </div>
+    """
+
+    st.markdown(recruiter_html, unsafe_allow_html=True)
+
+
 def show_course_cards(recs_df: pd.DataFrame) -> None:
     """Render learning recommendations as friendly cards."""
 
@@ -540,3 +660,39 @@ def show_course_cards(recs_df: pd.DataFrame) -> None:
             """,
             unsafe_allow_html=True,
         )
+
+
+def show_learning_path(steps: List[dict]) -> None:
+    """Render the skill-graph route to each missing skill, with courses for every hop."""
+
+    if not steps:
+        st.markdown(
+            "<div class='empty-state'>You already cover every skill this role asks for.</div>",
+            unsafe_allow_html=True,
+        )
+        return
+
+    for step in steps:
+        route = "<span class='path-arrow'>→</span>".join(
+            f"<span class='pill'>{escape(skill)}</span>" for skill in step["path"]
+        )
+        hops_html = []
+        for hop in step["hops"]:
+            courses = "".join(
+                f"<li>{escape(_clean(course.get('course_name'), 'Untitled course'))}"
+                f" <span class='similar-meta'>{escape(_clean(course.get('provider'), 'N/A'))} • {escape(_clean(course.get('rating'), 'N/A'))} / 5</span></li>"
+                for course in hop["courses"]
+            ) or "<li class='empty-copy'>No course covers this skill yet.</li>"
+            hop_label = (
+                f"{escape(hop['from'])} → {escape(hop['to'])}" if hop["from"] else f"Learn {escape(hop['to'])} directly"
+            )
+            hops_html.append(f"<div class='path-hop'><h4>{hop_label}</h4><ul class='detail-list'>{courses}</ul></div>")
+
+        st.markdown(
+            "<div class='card'>"
+            f"<h4>Reach {escape(step['target'])}</h4>"
+            f"<div class='tag-list path-route'>{route}</div>"
+            f"{''.join(hops_html)}"
+            "</div>",
+            unsafe_allow_html=True,
+        )
@@ -1,7 +1,184 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from io import StringIO
+
 import joblib
+import numpy as np
 import pandas as pd
 
-def load_model():
+from utils.analytics import build_skill_gap_cubes
+from utils.similarity import build_neighbor_tables
+from utils.skill_graph import build_skill_graph
+from utils.skills import update_skill_map
+
+MODEL_PATH = os.environ.get(
+    "SKILLGRAPH_MODEL_PATH",
+    "/Users/minhtan/Documents/GitHub/RecommendationSystem/final/models/minilm_recommender_light.pkl",
+)
+
+# Number of best-matching employees kept per job in the reverse index.
+CANDIDATES_PER_JOB = 50
+
+# Job cards shown on the Job Match tab; warm-up caches the same size so visits hit it.
+JOB_MATCHES_PER_USER = 6
+
+# Derived at load time and never written back into an artifact.
+RUNTIME_KEYS = ("artifact_hash", "job_index", "skill_graph", "skill_gap_cubes")
+
+# Employees allowed to see the recruiter view, besides rows whose ``role`` is "recruiter".
+RECRUITER_IDS = frozenset(
+    user_id.strip() for user_id in os.environ.get("SKILLGRAPH_RECRUITER_IDS", "").split(",") if user_id.strip()
+)
+
+# Result cache shared by every session (memory) and across restarts (SQLite).
+# It lives in a directory only this user can write, never the shared tmp dir.
+CACHE_PATH = os.environ.get(
+    "SKILLGRAPH_CACHE_PATH",
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "skillgraph",
+        "results.sqlite3",
+    ),
+)
+CACHE_MAX_ENTRIES = 2048
+# Part of every cache key: bump it when a cached frame's layout changes so rows
+# written by older code are dropped instead of served.
+CACHE_SCHEMA_VERSION = 1
+
+class ResultCache:
+    """
+    Two-tier cache for per-user result frames: a bounded in-process LRU in
+    front of a SQLite table. Entries are keyed by (kind, user_id, n, schema
+    version + artifact hash); seeing a new artifact hash or schema version
+    drops every entry of the old one.
+    Frames are stored as JSON, so reading a row can never run code, and a row
+    that fails to decode is deleted and recomputed.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._artifact = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _disk(self):
+        if self._conn is None and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "kind TEXT, user_id TEXT, n INTEGER, artifact TEXT, payload TEXT, "
+                    "PRIMARY KEY (kind, user_id, n, artifact))"
+                )
+                self._conn.commit()
+            except (OSError, sqlite3.Error):
+                # Read-only or missing directory: keep serving from memory only.
+                self.path = None
+                self._conn = None
+        return self._conn
+
+    def _switch_artifact(self, artifact):
+        self._memory.clear()
+        self._artifact = artifact
+        conn = self._disk()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM results WHERE artifact != ?", (artifact,))
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def get_or_compute(self, kind, user_id, n, artifact, compute):
+        artifact = f"v{CACHE_SCHEMA_VERSION}:{artifact}"
+        key = (kind, str(user_id), -1 if n is None else int(n), artifact)
+        with self._lock:
+            if artifact != self._artifact:
+                self._switch_artifact(artifact)
+
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key].copy()
+
+            conn = self._disk()
+            row = None
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT payload FROM results WHERE kind = ? AND user_id = ? AND n = ? AND artifact = ?",
+                        key,
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row is not None:
+                try:
+                    result = pd.read_json(StringIO(row[0]), orient="table")
+                except (ValueError, TypeError, KeyError):
+                    # Corrupt or written by an incompatible pandas: drop it and recompute.
+                    self._forget(conn, key)
+                else:
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, result)
+                    return result.copy()
+
+        result = compute()
+        with self._lock:
+            self.stats["misses"] += 1
+            self._remember(key, result)
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                        (*key, result.to_json(orient="table")),
+                    )
+                    conn.commit()
+                except (sqlite3.Error, ValueError, TypeError):
+                    pass
+        return result.copy()
+
+    def _forget(self, conn, key):
+        try:
+            conn.execute("DELETE FROM results WHERE kind = ? AND user_id = ? AND n = ? AND artifact = ?", key)
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            conn = self._disk()
+            if conn is not None:
+                conn.execute("DELETE FROM results")
+                conn.commit()
+
+    def metrics(self):
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries_in_memory": len(self._memory),
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+result_cache = ResultCache()
+
+def load_model(path=MODEL_PATH):
     """
     Load serialized model data (MiniLM recommender .pkl)
     Expected keys:
@@ -10,16 +187,117 @@ def load_model():
         - course_df
         - merged
         - recommendations
+    Derived at load time:
+        - job_index
+        - skill_map (only strings missing from a stored map are matched)
+        - neighbor_tables (unless precomputed into the artifact)
+        - skill_graph
+        - skill_gap_cubes
+    """
+    return prepare_model(read_artifact(path))
+
+def artifact_hash(path, build_id=None):
     """
-    data = joblib.load("/Users/minhtan/Documents/GitHub/RecommendationSystem/final/models/minilm_recommender_light.pkl")
+    Identity of an artifact; cached results are keyed on it. Uses the
+    ``build_id`` stored in the artifact when present, and falls back to a
+    file fingerprint (path, size, mtime) for artifacts written without one.
+    """
+    if build_id:
+        key = f"build:{build_id}"
+    else:
+        stat = os.stat(path)
+        key = f"file:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def read_artifact(path=MODEL_PATH):
+    """Unpickle an artifact and tag it with its identity."""
+    fingerprint = artifact_hash(path)
+    data = joblib.load(path)
+    data["artifact_hash"] = artifact_hash(path, data["build_id"]) if data.get("build_id") else fingerprint
+    return data
+
+def prepare_model(data):
+    """Attach the lookup structures derived from a freshly loaded artifact."""
+    update_skill_map(data)
+    if "neighbor_tables" not in data:
+        data["neighbor_tables"] = build_neighbor_tables(data)
+    # Always rebuilt, so they follow the current frames even if an older artifact stored them.
+    data["job_index"] = build_job_index(data)
+    data["skill_graph"] = build_skill_graph(data)
+    data["skill_gap_cubes"] = build_skill_gap_cubes(data)
     return data
 
+def save_model(data, path=MODEL_PATH):
+    """
+    Persist the artifact with its precomputed skill map and neighbour tables
+    only, under a fresh ``build_id`` so cached results of earlier builds are
+    never reused, whatever the file's size and mtime.
+    """
+    stored = {key: value for key, value in data.items() if key not in RUNTIME_KEYS}
+    stored["build_id"] = uuid.uuid4().hex
+    joblib.dump(stored, path)
+
+def build_job_index(data, k=CANDIDATES_PER_JOB):
+    """
+    Transpose the user-centric ``merged`` scores into a job -> employees index.
+    Each job keeps its top-``k`` employees as one contiguous, score-sorted
+    slice of flat arrays, bounded by ``offsets[pos]:offsets[pos + 1]``.
+    """
+    emp_df = data.get("employee_df", pd.DataFrame())
+    employees = emp_df.drop_duplicates(subset=["user_id"]).set_index("user_id") if "user_id" in emp_df.columns else pd.DataFrame()
+    index = {
+        "positions": {},
+        "offsets": np.zeros(1, dtype=np.int64),
+        "user_codes": np.zeros(0, dtype=np.int32),
+        "scores": np.zeros(0, dtype=np.float32),
+        "users": np.zeros(0, dtype=object),
+        "employees": employees,
+    }
+
+    merged = data.get("merged", pd.DataFrame())
+    if merged.empty or not {"user_id", "jid", "score"}.issubset(merged.columns):
+        return index
+
+    # Null ids would factorise to -1 and borrow the last job's or employee's identity.
+    frame = merged[["jid", "user_id", "score"]].dropna(subset=["jid", "user_id"])
+    frame["score"] = frame["score"].astype(float)
+    frame = frame.sort_values(by=["jid", "score"], ascending=[True, False], na_position="last", kind="stable")
+    frame = frame.drop_duplicates(subset=["jid", "user_id"], keep="first")
+    frame = frame[frame.groupby("jid", sort=False).cumcount() < k]
+
+    job_codes, jids = pd.factorize(frame["jid"])
+    user_codes, users = pd.factorize(frame["user_id"])
+    index["positions"] = {jid: pos for pos, jid in enumerate(jids)}
+    index["offsets"] = np.concatenate(([0], np.cumsum(np.bincount(job_codes, minlength=len(jids))))).astype(np.int64)
+    index["user_codes"] = user_codes.astype(np.int32)
+    index["scores"] = frame["score"].to_numpy(dtype=np.float32)
+    index["users"] = np.asarray(users, dtype=object)
+    return index
+
 def get_user_info(data, user_id):
     emp_df = data.get("employee_df", pd.DataFrame())
     info = emp_df[emp_df["user_id"] == user_id]
     return info.to_dict(orient="records")[0] if not info.empty else None
 
+def _cached(data, kind, user_id, n, compute):
+    artifact = data.get("artifact_hash")
+    if artifact is None:
+        return compute()
+    return result_cache.get_or_compute(kind, user_id, n, artifact, compute)
+
+def cache_metrics():
+    return result_cache.metrics()
+
+def is_recruiter(data, user_id):
+    if user_id in RECRUITER_IDS:
+        return True
+    user = get_user_info(data, user_id)
+    return bool(user) and str(user.get("role", "")).strip().lower() == "recruiter"
+
 def top_jobs_for_user(data, user_id, n=5):
+    return _cached(data, "top_jobs", user_id, n, lambda: _top_jobs_for_user(data, user_id, n))
+
+def _top_jobs_for_user(data, user_id, n):
     merged = data.get("merged", pd.DataFrame())
     if merged.empty:
         return pd.DataFrame()
@@ -94,9 +372,33 @@ def top_jobs_for_user(data, user_id, n=5):
     return combined[final_columns].head(n)
 
 def recommend_for_user(data, user_id):
+    return _cached(data, "courses", user_id, None, lambda: _recommend_for_user(data, user_id))
+
+def _recommend_for_user(data, user_id):
     recs = data.get("recommendations", {})
     if user_id not in recs:
         return pd.DataFrame()
     df = pd.DataFrame(recs[user_id])
     df["score"] = df["score"].astype(float)
     return df.sort_values(by="score", ascending=False)
+
+def top_candidates_for_job(data, jid, n=5):
+    index = data.get("job_index")
+    if index is None:
+        index = data["job_index"] = build_job_index(data)
+
+    pos = index["positions"].get(jid)
+    if pos is None:
+        return pd.DataFrame()
+
+    start = index["offsets"][pos]
+    stop = min(start + n, index["offsets"][pos + 1])
+    user_ids = index["users"][index["user_codes"][start:stop]]
+    candidates = pd.DataFrame({"user_id": user_ids, "score": index["scores"][start:stop].astype(float)})
+
+    employees = index["employees"]
+    if employees.empty:
+        return candidates
+    details = employees.reindex(user_ids).reset_index(drop=True)
+    details = details.drop(columns=[col for col in details.columns if col in candidates.columns])
+    return pd.concat([candidates, details], axis=1)
@@ -0,0 +1,144 @@
+"""Item-to-item neighbour tables for jobs and courses.
+
+Tables are computed offline with blocked matrix products over normalised
+skill vectors and keep only the top-k neighbours per item, so a lookup is a
+dict access plus a fixed-size slice. Precompute them into an artifact with::
+
+    python -m utils.similarity model.pkl
+"""
+import argparse
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.skills import split_skills, update_skill_map
+
+NEIGHBORS_PER_ITEM = 10
+BLOCK_SIZE = 1024
+# Sources of the item vectors: skill field, plus an optional title feature that
+# separates e.g. a "Data Analyst" from a "Software Engineer" with the same skills.
+ITEM_SOURCES = {
+    "job": ("job_df", "jid", "proj_quals", ("job_title", "title")),
+    "course": ("course_df", "course_id", "skills_taught", ()),
+}
+TITLE_WEIGHT = 0.5
+
+
+def _item_vectors(frame: pd.DataFrame, skill_column: str, title_column: Optional[str], skill_map: dict) -> np.ndarray:
+    features = {}
+    rows, cols, values = [], [], []
+    for row, value in enumerate(frame[skill_column] if skill_column in frame.columns else [None] * len(frame)):
+        for skill in split_skills(value, skill_map):
+            rows.append(row)
+            cols.append(features.setdefault(skill, len(features)))
+            values.append(1.0)
+    if title_column:
+        for row, title in enumerate(frame[title_column]):
+            if isinstance(title, str) and title.strip():
+                rows.append(row)
+                cols.append(features.setdefault(f"title:{title.strip().lower()}", len(features)))
+                values.append(TITLE_WEIGHT)
+
+    vectors = np.zeros((len(frame), max(len(features), 1)), dtype=np.float32)
+    vectors[rows, cols] = values
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def build_neighbor_table(vectors: np.ndarray, k: int = NEIGHBORS_PER_ITEM, block_size: int = BLOCK_SIZE) -> dict:
+    """Top-``k`` cosine neighbours per row, scored one ``block_size`` slab of rows at a time.
+
+    Slots without a positive score (nothing shared) hold neighbour ``-1``.
+    """
+    n_items = len(vectors)
+    k = max(min(k, n_items - 1), 0)
+    neighbors = np.full((n_items, k), -1, dtype=np.int32)
+    scores = np.zeros((n_items, k), dtype=np.float32)
+    if k == 0:
+        return {"neighbors": neighbors, "scores": scores}
+
+    for start in range(0, n_items, block_size):
+        stop = min(start + block_size, n_items)
+        block = vectors[start:stop] @ vectors.T
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        neighbors[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    neighbors[scores <= 0] = -1
+    return {"neighbors": neighbors, "scores": scores}
+
+
+def build_neighbor_tables(data, k: int = NEIGHBORS_PER_ITEM, block_size: int = BLOCK_SIZE) -> dict:
+    """Neighbour tables for every catalogue in ``ITEM_SOURCES`` present in the artifact."""
+    skill_map = data.setdefault("skill_map", {})
+    tables = {}
+    for kind, (frame_key, id_column, skill_column, title_columns) in ITEM_SOURCES.items():
+        frame = data.get(frame_key)
+        if frame is None or frame.empty or id_column not in frame.columns:
+            continue
+        # Positional rows of each catalogue item in the original frame.
+        rows = np.flatnonzero(~frame.duplicated(subset=[id_column]).to_numpy())
+        catalog = frame.iloc[rows]
+        title_column = next((col for col in title_columns if col in catalog.columns), None)
+        vectors = _item_vectors(catalog, skill_column, title_column, skill_map)
+        table = build_neighbor_table(vectors, k=k, block_size=block_size)
+        ids = catalog[id_column].to_numpy()
+        table["positions"] = {item_id: pos for pos, item_id in enumerate(ids)}
+        table["rows"] = rows.astype(np.int32)
+        tables[kind] = table
+    return tables
+
+
+def similar_items(data, kind: str, item_id, n: int = 5) -> pd.DataFrame:
+    tables = data.get("neighbor_tables")
+    if tables is None:
+        tables = data["neighbor_tables"] = build_neighbor_tables(data)
+    table = tables.get(kind)
+    if table is None:
+        return pd.DataFrame()
+
+    pos = table["positions"].get(item_id)
+    if pos is None:
+        return pd.DataFrame()
+
+    neighbors = table["neighbors"][pos, :n]
+    # Unrelated items are stored as -1 and never shown as "0% similar".
+    keep = neighbors >= 0
+    frame = data[ITEM_SOURCES[kind][0]]
+    similar = frame.iloc[table["rows"][neighbors[keep]]].reset_index(drop=True)
+    similar["similarity"] = table["scores"][pos, :n][keep].astype(float)
+    return similar
+
+
+def similar_jobs(data, jid, n: int = 5) -> pd.DataFrame:
+    return similar_items(data, "job", jid, n)
+
+
+def similar_courses(data, course_id, n: int = 5) -> pd.DataFrame:
+    return similar_items(data, "course", course_id, n)
+
+
+def main(argv=None) -> int:
+    # Imported here because the recommender builds missing tables via this module.
+    from utils.recommender import read_artifact, save_model
+
+    parser = argparse.ArgumentParser(description="Precompute job and course neighbour tables into an artifact.")
+    parser.add_argument("artifact", help="Path to the artifact (.pkl) to update in place")
+    parser.add_argument("-k", type=int, default=NEIGHBORS_PER_ITEM, help="Neighbours kept per item")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Rows scored per matrix product")
+    args = parser.parse_args(argv)
+
+    # Only the skill map and the tables are stored; everything else is rebuilt at load.
+    data = read_artifact(args.artifact)
+    update_skill_map(data)
+    data["neighbor_tables"] = build_neighbor_tables(data, k=args.k, block_size=args.block_size)
+    save_model(data, args.artifact)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
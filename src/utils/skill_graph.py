@@ -0,0 +1,191 @@
+"""Skill co-occurrence graph behind the Learning Path tab.
+
+Skills that appear together in a job's ``proj_quals``, an employee's
+``skill_name`` or a course's ``skills_taught`` are linked, with the number of
+shared records as the edge weight. The graph is stored as CSR arrays so a
+query only touches the neighbourhood it expands.
+"""
+import heapq
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.skills import SKILL_COLUMNS, split_skills
+
+MAX_HOPS = 4
+COURSES_PER_HOP = 3
+
+
+def _csr(sources: np.ndarray, n_rows: int, *columns: np.ndarray):
+    """Row pointer plus ``columns`` sorted by (source, first column)."""
+    order = np.lexsort((columns[0], sources))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(sources, minlength=n_rows))
+    return (indptr, *(column[order] for column in columns))
+
+
+def build_skill_graph(data) -> dict:
+    """Co-occurrence CSR adjacency over canonical skills, plus a skill -> courses index."""
+    skill_map = data.setdefault("skill_map", {})
+    skills: Dict[str, int] = {}
+    records, members = [], []
+    record_id = 0
+    for frame_key, column in SKILL_COLUMNS:
+        frame = data.get(frame_key)
+        if frame is None or column not in frame.columns:
+            continue
+        for value in frame[column]:
+            for skill in split_skills(value, skill_map):
+                records.append(record_id)
+                members.append(skills.setdefault(skill, len(skills)))
+            record_id += 1
+
+    n_skills = len(skills)
+    pairs = pd.DataFrame({"record": records, "skill": members})
+    edges = pairs.merge(pairs, on="record", suffixes=("_src", "_dst"))
+    edges = edges[edges["skill_src"] != edges["skill_dst"]]
+    edges = edges.groupby(["skill_src", "skill_dst"]).size().reset_index(name="weight")
+
+    weights = edges["weight"].to_numpy(dtype=np.int32)
+    # Frequent pairs cost 1 per hop; rarer pairs cost more, so paths prefer well-trodden links.
+    costs = (1.0 + np.log(weights.max() / weights)).astype(np.float32) if len(weights) else np.zeros(0, np.float32)
+    indptr, indices, weights, costs = _csr(
+        edges["skill_src"].to_numpy(dtype=np.int64),
+        n_skills,
+        edges["skill_dst"].to_numpy(dtype=np.int32),
+        weights,
+        costs,
+    )
+
+    course_indptr = np.zeros(n_skills + 1, dtype=np.int64)
+    course_rows = np.zeros(0, dtype=np.int32)
+    course_df = data.get("course_df")
+    if course_df is not None and "skills_taught" in course_df.columns:
+        taught = [
+            (skills[skill], row)
+            for row, value in enumerate(course_df["skills_taught"])
+            for skill in split_skills(value, skill_map)
+        ]
+        if taught:
+            taught_skills, taught_rows = (np.asarray(column) for column in zip(*taught))
+            rating = course_df["rating"].to_numpy(dtype=float) if "rating" in course_df.columns else np.zeros(len(course_df))
+            # Best-rated courses first within each skill.
+            order = np.lexsort((-rating[taught_rows], taught_skills))
+            course_rows = taught_rows[order].astype(np.int32)
+            course_indptr[1:] = np.cumsum(np.bincount(taught_skills, minlength=n_skills))
+
+    return {
+        "skills": np.array(list(skills), dtype=object),
+        "positions": skills,
+        "indptr": indptr,
+        "indices": indices,
+        "weights": weights,
+        "costs": costs,
+        "course_indptr": course_indptr,
+        "course_rows": course_rows,
+    }
+
+
+def _shortest_paths(graph: dict, sources: List[int], targets: set, max_hops: int):
+    """Multi-source Dijkstra over ``(skill, hops)`` states, stopping once every target settles.
+
+    Keeping the hop count in the state means a path that costs more but uses
+    fewer hops survives, so targets only reachable that way within
+    ``max_hops`` are still found. Returns the cheapest cost and skill path per
+    reached target.
+    """
+    heap = [(0.0, 0, source, None) for source in sources]
+    heapq.heapify(heap)
+    # A state is only worth expanding with fewer hops than any cheaper visit to its skill.
+    fewest_hops, parents = {}, {}
+    dist, paths, remaining = {}, {}, set(targets)
+
+    indptr, indices, costs = graph["indptr"], graph["indices"], graph["costs"]
+    while heap and remaining:
+        cost, hops, node, parent = heapq.heappop(heap)
+        if hops >= fewest_hops.get(node, max_hops + 1):
+            continue
+        fewest_hops[node] = hops
+        parents[(node, hops)] = parent
+        if node in remaining:
+            remaining.discard(node)
+            dist[node] = cost
+            chain, state = [], (node, hops)
+            while state is not None:
+                chain.append(state[0])
+                state = parents[state]
+            paths[node] = chain[::-1]
+        if hops == max_hops:
+            continue
+        for edge in range(indptr[node], indptr[node + 1]):
+            neighbor = int(indices[edge])
+            if hops + 1 < fewest_hops.get(neighbor, max_hops + 1):
+                heapq.heappush(heap, (cost + float(costs[edge]), hops + 1, neighbor, (node, hops)))
+    return dist, paths
+
+
+def _courses_for(graph: dict, course_df: Optional[pd.DataFrame], skill: int, limit: int) -> List[dict]:
+    if course_df is None or course_df.empty:
+        return []
+    start = graph["course_indptr"][skill]
+    rows = graph["course_rows"][start:min(start + limit, graph["course_indptr"][skill + 1])]
+    return course_df.iloc[rows].to_dict(orient="records")
+
+
+def skill_path(data, have: List[str], want: List[str], max_hops: int = MAX_HOPS, courses_per_hop: int = COURSES_PER_HOP) -> List[dict]:
+    """Cheapest route from the skills in ``have`` to each missing skill in ``want``.
+
+    Each entry holds the ``target`` skill, the ``path`` of skill names from an
+    existing skill to it, and one ``hops`` item per edge with the courses that
+    teach the skill reached. Targets out of reach become a single direct hop.
+    """
+    graph = data.get("skill_graph")
+    if graph is None:
+        graph = data["skill_graph"] = build_skill_graph(data)
+    positions, names = graph["positions"], graph["skills"]
+    course_df = data.get("course_df")
+
+    sources = [positions[skill] for skill in have if skill in positions]
+    missing = [skill for skill in want if skill not in have]
+    targets = {positions[skill] for skill in missing if skill in positions}
+    dist, paths = _shortest_paths(graph, sources, targets, max_hops) if sources else ({}, {})
+
+    steps = []
+    for skill in missing:
+        node = positions.get(skill)
+        if node is None or node not in dist:
+            path, cost = [skill], None
+            edges = [(None, skill)]
+        else:
+            path, cost = [str(names[index]) for index in paths[node]], dist[node]
+            edges = list(zip(path[:-1], path[1:]))
+
+        hops = [
+            {
+                "from": source,
+                "to": reached,
+                "courses": _courses_for(graph, course_df, positions[reached], courses_per_hop) if reached in positions else [],
+            }
+            for source, reached in edges
+        ]
+        steps.append({"target": skill, "path": path, "cost": cost, "hops": hops})
+    return steps
+
+
+def learning_path_for_job(data, user_id, jid, max_hops: int = MAX_HOPS) -> List[dict]:
+    """Skill path from an employee's declared skills to a job's ``proj_quals``."""
+    skill_map = data.setdefault("skill_map", {})
+    emp_df = data.get("employee_df", pd.DataFrame())
+    job_df = data.get("job_df", pd.DataFrame())
+    if emp_df.empty or job_df.empty:
+        return []
+
+    user = emp_df[emp_df["user_id"] == user_id]
+    job = job_df[job_df["jid"] == jid]
+    if user.empty or job.empty:
+        return []
+
+    have = split_skills(user.iloc[0].get("skill_name"), skill_map)
+    want = split_skills(job.iloc[0].get("proj_quals"), skill_map)
+    return skill_path(data, have, want, max_hops=max_hops)
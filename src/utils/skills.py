@@ -0,0 +1,175 @@
+"""Map free-text skill strings onto a curated vocabulary.
+
+Raw strings are first looked up exactly (after normalisation) against the
+canonical names and their aliases. Anything else is compared only with the
+vocabulary terms that share at least one character trigram with it, so the
+cost per string grows with its number of trigrams rather than with the size
+of the vocabulary. Results are cached in a plain ``{raw: canonical}`` dict
+that is stored on the artifact as ``skill_map``.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+SKILL_VOCABULARY = {
+    "Accounting": ["Financial Accounting", "Bookkeeping"],
+    "Communication": ["Communication Skills", "Business Communication", "Effective Communication"],
+    "Data Analysis": ["Data Analytics"],
+    "Data Structures": ["Data Structures and Algorithms", "DSA"],
+    "Data Visualization": ["Data Visualisation", "Data Viz", "Dashboarding"],
+    "Excel": ["Microsoft Excel", "MS Excel", "Spreadsheets"],
+    "Java": ["Java Programming", "Core Java"],
+    "Leadership": ["Team Leadership", "People Management"],
+    "Machine Learning": ["ML", "ML fundamentals", "Machine Learning Fundamentals"],
+    "Marketing Strategy": ["Digital Marketing Strategy"],
+    "Negotiation": ["Negotiation Skills"],
+    "Power BI": ["PowerBI", "Microsoft Power BI", "MS Power BI"],
+    "Project Management": ["PM", "Project Manager"],
+    "Project Planning": ["Project Scheduling"],
+    "Python": ["Python Programming", "Python 3", "Python3"],
+    "R": ["R Programming", "R Language"],
+    "SQL": ["Advanced SQL", "SQL Querying", "Structured Query Language"],
+    "Social Media": ["Social Media Marketing", "Social Media Management"],
+}
+SKILL_COLUMNS = (("employee_df", "skill_name"), ("job_df", "proj_quals"), ("course_df", "skills_taught"))
+# Minimum trigram Dice similarity for a fuzzy match to a vocabulary term.
+MATCH_THRESHOLD = 0.7
+# Words shorter than this must match exactly; longer ones may be one typo apart.
+TYPO_MIN_LENGTH = 4
+
+_index: Optional[dict] = None
+_default_map: Dict[str, str] = {}
+
+
+def _normalise(value: str) -> str:
+    return " ".join(re.sub(r"[^0-9a-z+#]+", " ", str(value).lower()).split())
+
+
+def _trigrams(normalised: str) -> frozenset:
+    grams = set()
+    for token in normalised.split():
+        padded = f"${token}$"
+        grams.update(padded[i:i + 3] for i in range(max(len(padded) - 2, 1)))
+    return frozenset(grams)
+
+
+def _dice(left: frozenset, right: frozenset) -> float:
+    return 2 * len(left & right) / (len(left) + len(right)) if left or right else 0.0
+
+
+def _one_typo_apart(word: str, other: str) -> bool:
+    """Equal, or one insertion, deletion, substitution or adjacent swap apart."""
+    if word == other:
+        return True
+    if min(len(word), len(other)) < TYPO_MIN_LENGTH or abs(len(word) - len(other)) > 1:
+        return False
+    prefix = 0
+    while prefix < min(len(word), len(other)) and word[prefix] == other[prefix]:
+        prefix += 1
+    word, other = word[prefix:], other[prefix:]
+    if len(word) == len(other):
+        return word[1:] == other[1:] or (word[:2] == other[1::-1] and word[2:] == other[2:])
+    return word[1:] == other or word == other[1:]
+
+
+def _covered(words: List[str], others: List[str]) -> bool:
+    """Whether every word in ``words`` is at most one typo from some word in ``others``."""
+    return all(any(_one_typo_apart(word, other) for other in others) for word in words)
+
+
+def build_skill_index(vocabulary=SKILL_VOCABULARY) -> dict:
+    """Exact-match table plus a trigram -> term postings list over every name and alias."""
+    exact, canonical, grams, words, postings = {}, [], [], [], {}
+    for name, aliases in vocabulary.items():
+        for term in [name, *aliases]:
+            normalised = _normalise(term)
+            exact.setdefault(normalised, name)
+            term_grams = _trigrams(normalised)
+            term_id = len(canonical)
+            canonical.append(name)
+            grams.append(term_grams)
+            words.append(normalised.split())
+            for gram in term_grams:
+                postings.setdefault(gram, []).append(term_id)
+    return {"exact": exact, "canonical": canonical, "grams": grams, "words": words, "postings": postings}
+
+
+def _match(raw: str, index: dict) -> str:
+    normalised = _normalise(raw)
+    if normalised in index["exact"]:
+        return index["exact"][normalised]
+
+    query = _trigrams(normalised)
+    query_words = normalised.split()
+    candidates = {term_id for gram in query for term_id in index["postings"].get(gram, ())}
+    best, best_score = None, 0.0
+    for term_id in candidates:
+        # Every word must show up on both sides, or "R Programming" would win on
+        # "programming" alone and "Communication Design" would become "Communication".
+        term_words = index["words"][term_id]
+        if not (_covered(term_words, query_words) and _covered(query_words, term_words)):
+            continue
+        term_grams = index["grams"][term_id]
+        score = _dice(query, term_grams)
+        if score > best_score or (score == best_score and best is not None and len(term_grams) > len(index["grams"][best])):
+            best, best_score = term_id, score
+
+    if best is None or best_score < MATCH_THRESHOLD:
+        return raw.strip()
+    return index["canonical"][best]
+
+
+def _skill_index() -> dict:
+    global _index
+    if _index is None:
+        _index = build_skill_index()
+    return _index
+
+
+def canonical_skill(raw: str, skill_map: Optional[Dict[str, str]] = None) -> str:
+    """Canonical name for ``raw``; new strings are matched once and added to ``skill_map``."""
+    skill_map = _default_map if skill_map is None else skill_map
+    key = str(raw).strip()
+    if key not in skill_map:
+        skill_map[key] = _match(key, _skill_index()) if key else key
+    return skill_map[key]
+
+
+def canonicalize_skills(values: Iterable[str], skill_map: Optional[Dict[str, str]] = None) -> List[str]:
+    """Canonicalise a list of raw skills, dropping blanks and duplicates but keeping order."""
+    seen = []
+    for value in values:
+        if value is None or not str(value).strip():
+            continue
+        skill = canonical_skill(value, skill_map)
+        if skill not in seen:
+            seen.append(skill)
+    return seen
+
+
+def split_skills(value, skill_map: Optional[Dict[str, str]] = None) -> List[str]:
+    """Split a comma-joined skill field and canonicalise each piece."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, list):
+        return canonicalize_skills(value, skill_map)
+    return canonicalize_skills(str(value).split(","), skill_map)
+
+
+def update_skill_map(data) -> Dict[str, str]:
+    """Map any skill strings in the artifact not yet in ``data["skill_map"]``.
+
+    The map also becomes the default cache used by the layout helpers.
+    """
+    global _default_map
+    skill_map = data.setdefault("skill_map", {})
+    for frame_key, column in SKILL_COLUMNS:
+        frame = data.get(frame_key)
+        if frame is None or column not in frame.columns:
+            continue
+        for value in frame[column].dropna().unique():
+            for piece in str(value).split(","):
+                canonical_skill(piece, skill_map)
+    _default_map = skill_map
+    return skill_map
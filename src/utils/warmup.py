@@ -0,0 +1,113 @@
+"""Process-level model warm-up and readiness reporting.
+
+The warmed artifact lives in this module, so every Streamlit session in the
+process reuses it instead of paying the pickle load on the first visit.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.recommender import (
+    JOB_MATCHES_PER_USER,
+    MODEL_PATH,
+    cache_metrics,
+    prepare_model,
+    read_artifact,
+    recommend_for_user,
+    top_jobs_for_user,
+)
+
+WARMUP_SAMPLE_USERS = 20
+DEFAULT_PORT = "8501"
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_state = {"data": None, "timings": {}, "error": None}
+
+
+@contextmanager
+def _stage(timings, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - started, 4)
+
+
+def ready_file() -> Path:
+    """File probes can poll: it exists only once warm-up has finished and is removed on exit.
+
+    ``SKILLGRAPH_READY_FILE`` overrides the default, which is keyed on the
+    Streamlit port so instances on one host stay apart. The serving pid and
+    status are written into the file.
+    """
+    configured = os.environ.get("SKILLGRAPH_READY_FILE")
+    if configured:
+        return Path(configured)
+    port = os.environ.get("STREAMLIT_SERVER_PORT", DEFAULT_PORT)
+    return Path(tempfile.gettempdir()) / f"skillgraph-{port}.ready"
+
+
+def _sample_views(data, sample_users):
+    """Fill the result cache with the Job Match and Learning Path views of the first ``sample_users``."""
+    emp_df = data.get("employee_df")
+    if emp_df is None or "user_id" not in emp_df.columns:
+        return
+    for user_id in emp_df["user_id"].drop_duplicates().head(sample_users):
+        top_jobs_for_user(data, user_id, n=JOB_MATCHES_PER_USER)
+        recommend_for_user(data, user_id)
+
+
+def warm_up(path=MODEL_PATH, sample_users=WARMUP_SAMPLE_USERS):
+    """Load the artifact, build lookups and pre-fill the result cache once per process."""
+    with _lock:
+        if _ready.is_set():
+            return _state["data"]
+
+        ready_path = ready_file()
+        ready_path.unlink(missing_ok=True)
+        timings = {}
+        _state["timings"] = timings
+        try:
+            with _stage(timings, "load_artifact"):
+                data = read_artifact(path)
+            with _stage(timings, "build_lookups"):
+                data = prepare_model(data)
+            if sample_users:
+                with _stage(timings, "sample_views"):
+                    _sample_views(data, sample_users)
+        except Exception as exc:
+            _state["error"] = repr(exc)
+            raise
+
+        _state["data"] = data
+        _state["error"] = None
+        timings["total"] = round(sum(timings.values()), 4)
+        _ready.set()
+        ready_path.write_text(json.dumps(status()), encoding="utf-8")
+        atexit.register(ready_path.unlink, missing_ok=True)
+        return data
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout=None) -> bool:
+    return _ready.wait(timeout)
+
+
+def status() -> dict:
+    """Readiness flag, serving pid, per-stage warm-up timings in seconds, the last error and result-cache metrics."""
+    return {
+        "ready": _ready.is_set(),
+        "pid": os.getpid(),
+        "timings": dict(_state["timings"]),
+        "error": _state["error"],
+        "cache": cache_metrics(),
+    }
@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from utils.analytics import build_skill_gap_cubes, gap_summary, top_missing_skills, update_employee, update_job
+
+
+def _artifact():
+    employee_df = pd.DataFrame(
+        {
+            "user_id": ["U1", "U2", "U3"],
+            "city": ["Hanoi", "Hanoi", "Da Nang"],
+            "skill_name": ["Python, SQL", "Excel", None],
+        }
+    )
+    job_df = pd.DataFrame(
+        {
+            "jid": ["J1", "J2"],
+            "proj_quals": ["Python, SQL, Power BI", "Excel, Accounting"],
+        }
+    )
+    merged = pd.DataFrame(
+        {
+            "user_id": ["U1", "U1", "U2", "U3"],
+            "jid": ["J1", "J2", "J2", "J1"],
+            "score": [0.9, 0.5, 0.8, 0.7],
+        }
+    )
+    data = {"employee_df": employee_df, "job_df": job_df, "merged": merged, "skill_map": {}}
+    data["skill_gap_cubes"] = build_skill_gap_cubes(data, attributes=("city",))
+    return data
+
+
+def _dense(cubes, attribute="city"):
+    """Group x skill counts keyed by names, so vocabularies built in another order compare equal."""
+    cube = cubes["cubes"][attribute]
+    skills = list(cubes["skills"])
+    active = cube["employees"] > 0
+    frames = {}
+    for key in ("required", "missing"):
+        frame = pd.DataFrame(cube[key], index=cube["groups"], columns=skills[: cube[key].shape[1]])[active]
+        frames[key] = frame.loc[:, (frame != 0).any()].sort_index().sort_index(axis=1)
+    employees = pd.Series(cube["employees"], index=cube["groups"])[active]
+    return employees.sort_index(), frames["required"], frames["missing"]
+
+
+def _assert_matches_rebuild(data):
+    rebuilt = build_skill_gap_cubes(data, attributes=("city",))
+    for patched, fresh in zip(_dense(data["skill_gap_cubes"]), _dense(rebuilt)):
+        if isinstance(patched, pd.Series):
+            pd.testing.assert_series_equal(patched, fresh)
+        else:
+            pd.testing.assert_frame_equal(patched, fresh)
+
+
+def test_build_counts_missing_skills_per_group():
+    data = _artifact()
+    summary = gap_summary(data["skill_gap_cubes"], "city").set_index("city")
+    # Hanoi: U1 lacks Power BI, Excel and Accounting; U2 lacks Accounting.
+    assert summary.loc["Hanoi", "employees"] == 2
+    assert summary.loc["Hanoi", "missing_skills"] == 4
+    assert summary.loc["Da Nang", "missing_skills"] == 3
+    top = top_missing_skills(data["skill_gap_cubes"], "city", group="Hanoi")
+    assert top.iloc[0]["skill"] == "Accounting"
+    assert top.iloc[0]["share"] == pytest.approx(1.0)
+
+
+def test_update_employee_matches_rebuild():
+    data = _artifact()
+    emp_df = data["employee_df"]
+    emp_df.loc[emp_df["user_id"] == "U2", ["skill_name", "city"]] = ["Excel, Accounting, Negotiation", "Da Nang"]
+    update_employee(data, "U2")
+    _assert_matches_rebuild(data)
+
+
+def test_update_job_matches_rebuild():
+    data = _artifact()
+    job_df = data["job_df"]
+    job_df.loc[job_df["jid"] == "J1", "proj_quals"] = "Python, Machine Learning"
+    update_job(data, "J1")
+    _assert_matches_rebuild(data)
+
+
+def test_added_and_removed_employees_match_rebuild():
+    data = _artifact()
+    new_row = pd.DataFrame({"user_id": ["U4"], "city": ["Hue"], "skill_name": ["Java"]})
+    data["employee_df"] = pd.concat([data["employee_df"], new_row], ignore_index=True)
+    data["merged"] = pd.concat(
+        [data["merged"], pd.DataFrame({"user_id": ["U4"], "jid": ["J1"], "score": [0.6]})], ignore_index=True
+    )
+    update_employee(data, "U4")
+    _assert_matches_rebuild(data)
+
+    data["employee_df"] = data["employee_df"][data["employee_df"]["user_id"] != "U1"].reset_index(drop=True)
+    data["merged"] = data["merged"][data["merged"]["user_id"] != "U1"].reset_index(drop=True)
+    update_employee(data, "U1")
+    _assert_matches_rebuild(data)
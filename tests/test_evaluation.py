@@ -0,0 +1,73 @@
+import math
+
+import pandas as pd
+import pytest
+
+from utils import evaluation
+
+
+def _artifact():
+    merged = pd.DataFrame(
+        {
+            "user_id": ["A"] * 3 + ["B"] * 3 + ["C"] * 3,
+            "jid": ["a1", "a2", "a3", "b1", "b2", "b3", "c1", "c2", "c3"],
+            "score": [0.9, 0.8, 0.7] * 3,
+        }
+    )
+    return {"merged": merged, "recommendations": {}}
+
+
+def _holdout():
+    return pd.DataFrame(
+        {
+            "user_id": ["A", "B", "B", "C"],
+            "item_id": ["a1", "b2", "b9", "c9"],
+            "kind": "job",
+        }
+    )
+
+
+def _expected():
+    # A hits at rank 1 of 1 relevant, B at rank 2 of 2 relevant, C misses.
+    dcg_b = 1 / math.log2(3)
+    return {
+        "precision@3": (1 / 3 + 1 / 3 + 0) / 3,
+        "recall@3": (1 + 0.5 + 0) / 3,
+        "map@3": (1 + 0.5 / 2 + 0) / 3,
+        "ndcg@3": (1 + dcg_b / (1 + dcg_b) + 0) / 3,
+    }
+
+
+def test_metrics_match_hand_computed_values():
+    report = evaluation.evaluate(_artifact(), _holdout(), k=3, workers=1)
+    values = dict(zip(report["metric"], report["value"]))
+    assert values == pytest.approx(_expected())
+    assert set(report["users"]) == {3}
+
+
+def test_sharded_pool_matches_serial(monkeypatch):
+    monkeypatch.setattr(evaluation, "PARALLEL_MIN_USERS", 1)
+    report = evaluation.evaluate(_artifact(), _holdout(), k=3, workers=2)
+    assert dict(zip(report["metric"], report["value"])) == pytest.approx(_expected())
+
+
+def test_ranking_respects_scores_and_cutoff():
+    data = _artifact()
+    data["merged"].loc[data["merged"]["jid"] == "a3", "score"] = 1.0
+    holdout = pd.DataFrame({"user_id": ["A"], "item_id": ["a3"], "kind": "job"})
+    report = evaluation.evaluate(data, holdout, k=1, workers=1)
+    assert dict(zip(report["metric"], report["value"]))["precision@1"] == pytest.approx(1.0)
+
+
+def test_course_names_resolve_to_course_ids():
+    data = _artifact()
+    data["course_df"] = pd.DataFrame({"course_id": ["C1", "C2"], "course_name": ["SQL Basics", "Excel 101"]})
+    data["recommendations"] = {
+        "A": [{"course_name": "Excel 101", "score": 0.9}, {"course_id": "C1", "score": 0.5}],
+        "B": [{"course_name": "Unknown course", "score": 0.9}],
+    }
+    holdout = pd.DataFrame({"user_id": ["A", "B"], "item_id": ["C2", "C1"], "kind": "course"})
+    with pytest.warns(UserWarning, match="1 course recommendations"):
+        report = evaluation.evaluate(data, holdout, k=1, workers=1)
+    values = dict(zip(report.loc[report["kind"] == "course", "metric"], report.loc[report["kind"] == "course", "value"]))
+    assert values["precision@1"] == pytest.approx(0.5)
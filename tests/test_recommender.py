@@ -0,0 +1,154 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils import recommender
+from utils.recommender import (
+    CACHE_SCHEMA_VERSION,
+    ResultCache,
+    artifact_hash,
+    build_job_index,
+    read_artifact,
+    save_model,
+    top_candidates_for_job,
+)
+
+
+def _frame(user_id):
+    return pd.DataFrame({"jid": ["J2", "J1"], "user_id": [user_id] * 2, "score": [0.9, 0.4]}, index=[7, 3])
+
+
+class _Compute:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, user_id="U1"):
+        self.calls += 1
+        return _frame(user_id)
+
+
+def test_memory_then_disk_hits(tmp_path):
+    path = str(tmp_path / "cache" / "results.sqlite3")
+    compute = _Compute()
+    cache = ResultCache(path)
+    first = cache.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    again = cache.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    pd.testing.assert_frame_equal(first, again)
+    assert compute.calls == 1
+    assert cache.metrics()["memory_hits"] == 1
+    assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o700
+
+    restarted = ResultCache(path)
+    from_disk = restarted.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    pd.testing.assert_frame_equal(from_disk, _frame("U1"))
+    assert compute.calls == 1
+    assert restarted.metrics()["disk_hits"] == 1
+
+
+def test_corrupt_row_is_dropped_and_recomputed(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    compute = _Compute()
+    ResultCache(path).get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE results SET payload = ?", (b"\x80\x04not json",))
+
+    cache = ResultCache(path)
+    result = cache.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    pd.testing.assert_frame_equal(result, _frame("U1"))
+    assert compute.calls == 2
+    assert cache.metrics()["misses"] == 1
+    restarted = ResultCache(path)
+    restarted.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    assert restarted.metrics()["disk_hits"] == 1
+    assert compute.calls == 2
+
+
+def test_new_artifact_drops_old_entries(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    compute = _Compute()
+    cache = ResultCache(path)
+    cache.get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    cache.get_or_compute("top_jobs", "U1", 5, "a2", compute)
+    assert compute.calls == 2
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT DISTINCT artifact FROM results").fetchall() == [(f"v{CACHE_SCHEMA_VERSION}:a2",)]
+
+
+def test_returned_frames_are_copies(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"))
+    cache.get_or_compute("courses", "U1", None, "a1", _Compute())["score"] = 0.0
+    assert cache.get_or_compute("courses", "U1", None, "a1", _Compute())["score"].tolist() == [0.9, 0.4]
+
+
+def test_artifact_hash_follows_file_changes(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"one")
+    first = artifact_hash(path)
+    assert artifact_hash(path) == first
+    path.write_bytes(b"longer")
+    assert artifact_hash(path) != first
+
+
+def test_saved_builds_get_new_identity_despite_same_size_and_mtime(tmp_path):
+    path = tmp_path / "model.pkl"
+    save_model({"merged": pd.DataFrame({"score": [0.1]})}, path)
+    stat = os.stat(path)
+    first = read_artifact(path)["artifact_hash"]
+    assert read_artifact(path)["artifact_hash"] == first
+
+    save_model({"merged": pd.DataFrame({"score": [0.9]})}, path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(path).st_size == stat.st_size
+    assert read_artifact(path)["artifact_hash"] != first
+
+
+def test_schema_version_change_drops_cached_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.sqlite3")
+    compute = _Compute()
+    ResultCache(path).get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    monkeypatch.setattr(recommender, "CACHE_SCHEMA_VERSION", CACHE_SCHEMA_VERSION + 1)
+    ResultCache(path).get_or_compute("top_jobs", "U1", 5, "a1", compute)
+    assert compute.calls == 2
+
+
+def _job_artifact():
+    employee_df = pd.DataFrame(
+        {"user_id": ["U1", "U2", "U3"], "full_name": ["An", "Binh", "Chi"], "city": ["Hanoi", "Hue", "Hanoi"]}
+    )
+    merged = pd.DataFrame(
+        {
+            "user_id": ["U1", "U2", "U3", "U1", "U3", None, "U2"],
+            "jid": ["J1", "J1", "J1", "J1", "J2", "J2", None],
+            "score": [0.5, 0.9, 0.7, 0.2, 0.3, 0.8, 1.0],
+        }
+    )
+    return {"employee_df": employee_df, "merged": merged}
+
+
+def test_top_candidates_are_score_ordered_and_capped():
+    data = _job_artifact()
+    data["job_index"] = build_job_index(data, k=2)
+    candidates = top_candidates_for_job(data, "J1", n=5)
+    assert candidates["user_id"].tolist() == ["U2", "U3"]
+    assert candidates["score"].tolist() == pytest.approx([0.9, 0.7])
+    assert top_candidates_for_job(data, "J1", n=1)["user_id"].tolist() == ["U2"]
+
+
+def test_top_candidates_join_employee_details():
+    data = _job_artifact()
+    candidates = top_candidates_for_job(data, "J1", n=3)
+    assert candidates["full_name"].tolist() == ["Binh", "Chi", "An"]
+    assert candidates["city"].tolist() == ["Hue", "Hanoi", "Hanoi"]
+
+
+def test_null_ids_are_not_indexed():
+    data = _job_artifact()
+    candidates = top_candidates_for_job(data, "J2", n=5)
+    assert candidates["user_id"].tolist() == ["U3"]
+    assert candidates["score"].tolist() == pytest.approx([0.3])
+
+
+def test_unknown_job_has_no_candidates():
+    assert top_candidates_for_job(_job_artifact(), "J9").empty
@@ -0,0 +1,45 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils import similarity
+from utils.recommender import load_model
+from utils.similarity import build_neighbor_table, similar_jobs
+
+
+def _artifact():
+    job_df = pd.DataFrame(
+        {
+            "jid": ["J1", "J2", "J3", "J4"],
+            "job_title": ["Data Analyst", "Data Analyst", "Accountant", None],
+            "proj_quals": ["Python, SQL", "Python, SQL, Excel", "Accounting", None],
+        }
+    )
+    return {"job_df": job_df, "skill_map": {}}
+
+
+def test_neighbors_ranked_by_cosine():
+    vectors = np.array([[1, 0], [0.8, 0.6], [0, 1]], dtype=np.float32)
+    table = build_neighbor_table(vectors, k=2, block_size=2)
+    assert table["neighbors"][0].tolist() == [1, -1]
+    assert table["neighbors"][1].tolist() == [0, 2]
+    np.testing.assert_allclose(table["scores"][1], [0.8, 0.6], rtol=1e-6)
+
+
+def test_unrelated_jobs_are_not_listed():
+    data = _artifact()
+    assert similar_jobs(data, "J1")["jid"].tolist() == ["J2"]
+    assert (similar_jobs(data, "J1")["similarity"] > 0).all()
+    assert similar_jobs(data, "J3").empty
+    assert similar_jobs(data, "J4").empty
+
+
+def test_main_stores_only_tables_and_skill_map(tmp_path):
+    path = tmp_path / "model.pkl"
+    joblib.dump(_artifact(), path)
+    assert similarity.main([str(path)]) == 0
+
+    stored = joblib.load(path)
+    assert sorted(stored) == ["build_id", "job_df", "neighbor_tables", "skill_map"]
+    assert "job" in stored["neighbor_tables"]
+    assert "skill_gap_cubes" in load_model(str(path))
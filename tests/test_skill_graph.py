@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.skill_graph import _csr, _shortest_paths, skill_path
+
+
+def _graph(edges):
+    """Undirected toy graph from ``(source, target, cost)`` triples over single-letter skills."""
+    names = sorted({name for source, target, _ in edges for name in (source, target)})
+    positions = {name: pos for pos, name in enumerate(names)}
+    sources = [positions[s] for s, t, _ in edges] + [positions[t] for s, t, _ in edges]
+    targets = [positions[t] for s, t, _ in edges] + [positions[s] for s, t, _ in edges]
+    costs = [cost for *_, cost in edges] * 2
+    indptr, indices, costs = _csr(
+        np.asarray(sources, dtype=np.int64),
+        len(names),
+        np.asarray(targets, dtype=np.int32),
+        np.asarray(costs, dtype=np.float32),
+    )
+    return {
+        "skills": np.array(names, dtype=object),
+        "positions": positions,
+        "indptr": indptr,
+        "indices": indices,
+        "costs": costs,
+        "course_indptr": np.zeros(len(names) + 1, dtype=np.int64),
+        "course_rows": np.zeros(0, dtype=np.int32),
+    }
+
+
+TOY_EDGES = [("S", "X", 0.1), ("X", "Y", 0.1), ("S", "Y", 1.0), ("Y", "T", 0.1)]
+
+
+def test_hop_limit_keeps_costlier_shorter_paths():
+    graph = _graph(TOY_EDGES)
+    positions = graph["positions"]
+    dist, paths = _shortest_paths(graph, [positions["S"]], {positions["T"]}, max_hops=2)
+    assert [graph["skills"][node] for node in paths[positions["T"]]] == ["S", "Y", "T"]
+    assert dist[positions["T"]] == pytest.approx(1.1)
+
+
+def test_cheapest_path_wins_when_hops_allow():
+    graph = _graph(TOY_EDGES)
+    steps = skill_path({"skill_graph": graph, "course_df": pd.DataFrame()}, ["S"], ["T"], max_hops=3)
+    assert steps[0]["path"] == ["S", "X", "Y", "T"]
+    assert steps[0]["cost"] == pytest.approx(0.3)
+    assert [hop["to"] for hop in steps[0]["hops"]] == ["X", "Y", "T"]
+
+
+def test_unreachable_target_becomes_direct_hop():
+    graph = _graph(TOY_EDGES)
+    steps = skill_path({"skill_graph": graph, "course_df": pd.DataFrame()}, ["S"], ["T"], max_hops=1)
+    assert steps[0]["path"] == ["T"]
+    assert steps[0]["cost"] is None
@@ -0,0 +1,55 @@
+import pytest
+
+from utils.skills import canonical_skill, split_skills
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("python", "Python"),
+        ("MS Excel", "Excel"),
+        ("Power-BI", "Power BI"),
+        ("Pyhton programming", "Python"),
+        ("Machine Lerning", "Machine Learning"),
+        ("Microsoft Excell", "Excel"),
+        ("Data Analytcs", "Data Analysis"),
+        ("Comunication Skills", "Communication"),
+        ("Project Managment", "Project Management"),
+        ("Data Visualisations", "Data Visualization"),
+        ("Social Media Marketng", "Social Media"),
+        ("Negotation", "Negotiation"),
+        ("Leadershp", "Leadership"),
+        ("Project Planing", "Project Planning"),
+    ],
+)
+def test_matches_aliases_and_typos(raw, expected):
+    assert canonical_skill(raw, {}) == expected
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "Excellence",
+        "Java Script",
+        "JavaScript",
+        "Communication Design",
+        "Marketing Analytics",
+        "Web Analytics",
+        "Analytics",
+        "Marketing",
+        "Algorithms",
+        "Visualization",
+        "R Studio Connect",
+        "Product Management",
+        "Product Manager",
+        "Team Leader",
+    ],
+)
+def test_supersets_and_broad_words_stay_unmapped(raw):
+    assert canonical_skill(raw, {}) == raw
+
+
+def test_split_skills_caches_matches_and_dedupes():
+    skill_map = {}
+    assert split_skills("Python, python 3 ,Pyhton programming, , Excellence", skill_map) == ["Python", "Excellence"]
+    assert skill_map["Pyhton programming"] == "Python"
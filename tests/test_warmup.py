@@ -0,0 +1,73 @@
+import json
+
+import joblib
+import pandas as pd
+import pytest
+
+from utils import recommender, warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(tmp_path, monkeypatch):
+    """Each test starts cold, with its own ready file and result cache."""
+    monkeypatch.setenv("SKILLGRAPH_READY_FILE", str(tmp_path / "skillgraph.ready"))
+    monkeypatch.setattr(recommender, "result_cache", recommender.ResultCache(str(tmp_path / "results.sqlite3")))
+    warmup._ready.clear()
+    warmup._state.update({"data": None, "timings": {}, "error": None})
+    yield
+    warmup._ready.clear()
+    warmup._state.update({"data": None, "timings": {}, "error": None})
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = tmp_path / "model.pkl"
+    joblib.dump(
+        {
+            "employee_df": pd.DataFrame({"user_id": ["U1", "U2"], "skill_name": ["Python", "Excel"]}),
+            "job_df": pd.DataFrame({"jid": ["J1"], "job_title": ["Analyst"], "proj_quals": ["Python, SQL"]}),
+            "course_df": pd.DataFrame({"course_id": ["C1"], "course_name": ["SQL Basics"], "skills_taught": ["SQL"]}),
+            "merged": pd.DataFrame({"user_id": ["U1", "U2"], "jid": ["J1", "J1"], "score": [0.9, 0.4]}),
+            "recommendations": {"U1": [{"course_id": "C1", "course_name": "SQL Basics", "score": 0.8}]},
+        },
+        path,
+    )
+    return str(path)
+
+
+def test_ready_only_after_success(artifact):
+    assert not warmup.is_ready()
+    assert not warmup.ready_file().exists()
+
+    data = warmup.warm_up(artifact, sample_users=0)
+    assert warmup.is_ready()
+    assert "job_index" in data
+    written = json.loads(warmup.ready_file().read_text(encoding="utf-8"))
+    assert written["ready"] is True
+    assert set(written["timings"]) == {"load_artifact", "build_lookups", "total"}
+    assert warmup.warm_up(artifact) is data
+
+
+def test_failed_load_records_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        warmup.warm_up(str(tmp_path / "missing.pkl"))
+    state = warmup.status()
+    assert not state["ready"]
+    assert "FileNotFoundError" in state["error"]
+    assert not warmup.ready_file().exists()
+
+
+def test_sample_views_fill_result_cache(artifact):
+    data = warmup.warm_up(artifact, sample_users=2)
+    assert "sample_views" in warmup.status()["timings"]
+    assert warmup.status()["cache"]["misses"] == 4
+
+    recommender.top_jobs_for_user(data, "U1", n=recommender.JOB_MATCHES_PER_USER)
+    recommender.recommend_for_user(data, "U2")
+    assert warmup.status()["cache"]["memory_hits"] == 2
+
+
+def test_default_ready_file_is_keyed_on_port(monkeypatch):
+    monkeypatch.delenv("SKILLGRAPH_READY_FILE")
+    monkeypatch.setenv("STREAMLIT_SERVER_PORT", "8600")
+    assert warmup.ready_file().name == "skillgraph-8600.ready"